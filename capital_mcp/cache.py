@@ -0,0 +1,104 @@
+"""Small async caches for broker reads.
+
+TTLCache keeps values per key until their TTL expires. Concurrent misses on the
+same key await one shared load (success or error), so N callers cost one
+upstream request. Entries are evicted oldest-first beyond ``maxsize``. With
+``stale_s`` set, an expired entry is still served for that long while a
+background load refreshes it (stale-while-revalidate).
+
+SingleFlight only coalesces identical requests that are in flight at the same
+time, for reads that must not be served stale (prices, live market details).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+_caches: list[TTLCache | SingleFlight] = []
+
+
+class TTLCache:
+    """Per-key TTL cache whose loads are single-flighted."""
+
+    def __init__(self, ttl_s: float, maxsize: int = 256, stale_s: float = 0) -> None:
+        self.ttl_s = ttl_s
+        self.maxsize = maxsize
+        self.stale_s = stale_s
+        # key -> (fresh until, servable until, value), in monotonic seconds
+        self._data: OrderedDict[Hashable, tuple[float, float, Any]] = OrderedDict()
+        self._flight = SingleFlight(register=False)
+        _caches.append(self)
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for ``key``, calling ``load()`` once on a miss.
+
+        Concurrent misses await the same load, so they also share its error.
+        A stale entry (within ``stale_s`` past its TTL) is returned at once and
+        refreshed in the background; a failed refresh leaves it in place.
+        """
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[2]
+
+        async def load_and_store() -> Any:
+            value = await load()
+            now = time.monotonic()
+            self._data[key] = (now + self.ttl_s, now + self.ttl_s + self.stale_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+
+        if entry is not None and entry[1] > time.monotonic():
+            self._flight.start(key, load_and_store)
+            return entry[2]
+        return await self._flight.do(key, load_and_store)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._flight.clear()
+
+
+class SingleFlight:
+    """Share one in-flight load between concurrent callers with the same key.
+
+    Nothing is kept once the load finishes, so results are never stale; only
+    callers that overlap in time are coalesced.
+    """
+
+    def __init__(self, *, register: bool = True) -> None:
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+        if register:
+            _caches.append(self)
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        # shield: one caller being cancelled must not cancel the others' load.
+        return await asyncio.shield(self.start(key, load))
+
+    def start(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> asyncio.Future[Any]:
+        """Start ``load()`` for ``key`` unless one is already running; return its future."""
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(load())
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda f: self._done(key, f))
+        return fut
+
+    def _done(self, key: Hashable, fut: asyncio.Future[Any]) -> None:
+        if self._inflight.get(key) is fut:
+            del self._inflight[key]
+        if not fut.cancelled():
+            fut.exception()  # mark retrieved even if every caller went away
+
+    def clear(self) -> None:
+        self._inflight.clear()
+
+
+def reset() -> None:
+    """Clear every cache (tests / re-init)."""
+    for cache in _caches:
+        cache.clear()
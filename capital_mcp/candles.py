@@ -0,0 +1,95 @@
+"""Rolling OHLC windows so repeat price reads only download new bars.
+
+A plain ``cap_market_prices`` call (no from/to range) for an (EPIC, resolution)
+seen before asks the broker only for bars since the last cached ones, then
+slides the cached window forward instead of re-downloading the full lookback.
+The last cached bar is refetched on every call, since it may still be forming.
+
+Anything that cannot be merged safely falls back to a full fetch: an explicit
+date range, a bigger ``max`` than the window holds, bars without timestamps,
+a tail that fills a whole page (the gap may be longer than one request), or a
+tail request that fails (the window is dropped and rebuilt from the full fetch).
+
+State is process-local and bounded (MAX_BARS per window, MAX_WINDOWS windows,
+evicted oldest-first).
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any
+
+MAX_BARS = 1000  # broker's per-request cap on `max`
+MAX_WINDOWS = 256
+
+_TS = "snapshotTimeUTC"
+
+_windows: OrderedDict[tuple[str, str], tuple[dict[str, Any], deque[dict[str, Any]]]] = (
+    OrderedDict()
+)
+
+Fetch = Callable[..., Awaitable[dict[str, Any]]]
+
+
+async def prices(fetch: Fetch, epic: str, resolution: str, max_candles: int) -> dict[str, Any]:
+    """Return the latest ``max_candles`` bars, fetching only the tail when possible.
+
+    ``fetch`` is the SDK's ``markets.prices``.
+    """
+    key = (epic, resolution)
+    window = _windows.get(key)
+    if window is not None and len(window[1]) >= max(max_candles, 2):
+        meta, bars = window
+        # Anchor on the second-to-last bar: whether the broker's `from` is
+        # inclusive or not, the still-forming last bar comes back refreshed.
+        try:
+            tail = await fetch(
+                epic,
+                resolution=resolution,
+                max_candles=MAX_BARS,
+                from_date=bars[-2][_TS],
+                to_date=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+            )
+        except Exception:  # noqa: BLE001 - the full fetch below rebuilds the window
+            _windows.pop(key, None)
+            tail = None
+        new = (tail or {}).get("prices") or []
+        if tail is not None and len(new) < MAX_BARS and all(_TS in b for b in new):
+            _merge(bars, new)
+            _windows.move_to_end(key)
+            return {**meta, "prices": list(islice(bars, len(bars) - max_candles, None))}
+
+    data = await fetch(
+        epic, resolution=resolution, max_candles=max_candles, from_date=None, to_date=None
+    )
+    _store(key, data)
+    return data
+
+
+def _merge(bars: deque[dict[str, Any]], new: list[dict[str, Any]]) -> None:
+    if not new:
+        return
+    first = new[0][_TS]
+    while bars and bars[-1][_TS] >= first:
+        bars.pop()
+    bars.extend(new)
+
+
+def _store(key: tuple[str, str], data: dict[str, Any]) -> None:
+    bars = data.get("prices")
+    if not isinstance(bars, list) or not all(isinstance(b, dict) and _TS in b for b in bars):
+        _windows.pop(key, None)
+        return
+    meta = {k: v for k, v in data.items() if k != "prices"}
+    _windows[key] = (meta, deque(bars, maxlen=MAX_BARS))
+    _windows.move_to_end(key)
+    while len(_windows) > MAX_WINDOWS:
+        _windows.popitem(last=False)
+
+
+def reset() -> None:
+    """Forget every cached window (tests / re-init)."""
+    _windows.clear()
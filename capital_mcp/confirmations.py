@@ -0,0 +1,130 @@
+"""Background deal-confirmation tracking.
+
+When execute/close/cancel run with wait_for_confirm=false the tool returns the
+broker's dealReference straight away. We keep polling /confirms for that
+reference in a detached task so a later cap_trade_confirm_get can answer from
+memory once the broker has accepted or rejected the deal.
+
+State is process-local (like the SDK's own singletons). Finished tasks drop out
+of the task map via a done-callback, and only terminal confirmations are kept,
+in a bounded oldest-first map, so nothing grows without limit. The same task
+map single-flights cap_trade_confirm_wait: concurrent waits on one reference
+share a single poll loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"ACCEPTED", "REJECTED"})
+MAX_RESULTS = 256
+
+_tasks: dict[str, asyncio.Task[dict[str, Any]]] = {}
+_results: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+
+Poll = Callable[[], Awaitable[dict[str, Any]]]
+PollFor = Callable[[float], Awaitable[dict[str, Any]]]  # takes a timeout in seconds
+
+
+def track(deal_reference: str, poll: Poll) -> None:
+    """Run ``poll()`` in the background and remember its terminal result.
+
+    A reference that is already being tracked or already settled is ignored.
+    """
+    if deal_reference not in _results:
+        _ensure_task(deal_reference, poll)
+
+
+async def wait(deal_reference: str, poll: PollFor, *, timeout_s: float) -> dict[str, Any]:
+    """Wait for a reference's confirmation, sharing one poll between concurrent callers.
+
+    ``poll(seconds)`` polls /confirms for up to ``seconds``. The first caller
+    starts it for ``timeout_s``; later callers (and any background tracker)
+    await the same task, so N waiters cost one /confirms poll loop. A caller
+    that joined someone else's poll keeps its own deadline: if that poll ends
+    unsettled first, a new one is started for the time the caller has left.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s
+    window = timeout_s
+    while True:
+        settled = lookup(deal_reference)
+        if settled is not None:
+            return settled
+        joined = deal_reference in _tasks
+        task = _ensure_task(deal_reference, functools.partial(poll, window))
+        # shield: one caller giving up must not cancel the poll for the others.
+        if not joined:
+            # Our own poll already stops at our deadline; no second timer needed.
+            return await asyncio.shield(task)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), deadline - loop.time())
+        except asyncio.TimeoutError:
+            return {"status": "TIMEOUT", "message": f"Confirmation timed out after {timeout_s}s"}
+        window = deadline - loop.time()
+        if result.get("dealStatus") in TERMINAL_STATUSES or window <= 0:
+            return result
+
+
+def _ensure_task(deal_reference: str, poll: Poll) -> asyncio.Task[dict[str, Any]]:
+    task = _tasks.get(deal_reference)
+    if task is None:
+        task = asyncio.create_task(_run(poll))
+        _tasks[deal_reference] = task
+        task.add_done_callback(lambda t: _on_done(deal_reference, t))
+    return task
+
+
+async def _run(poll: Poll) -> dict[str, Any]:
+    return await poll()
+
+
+def _on_done(deal_reference: str, task: asyncio.Task[dict[str, Any]]) -> None:
+    _tasks.pop(deal_reference, None)
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.debug("Background confirmation for %s failed: %s", deal_reference, exc)
+        return
+    remember(deal_reference, task.result())
+
+
+def remember(deal_reference: str, confirmation: dict[str, Any]) -> None:
+    """Store a raw /confirms payload if the deal is settled (dealStatus ACCEPTED/REJECTED)."""
+    if confirmation.get("dealStatus") not in TERMINAL_STATUSES:
+        return
+    _results[deal_reference] = confirmation
+    _results.move_to_end(deal_reference)
+    while len(_results) > MAX_RESULTS:
+        _results.popitem(last=False)
+
+
+def lookup(deal_reference: str) -> dict[str, Any] | None:
+    """Return the settled confirmation for a reference, or None if unknown/pending."""
+    return _results.get(deal_reference)
+
+
+async def aclose() -> None:
+    """Cancel pending polls and wait for them to unwind (server shutdown)."""
+    pending = list(_tasks.values())
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    _tasks.clear()
+
+
+def reset() -> None:
+    """Cancel pending polls and forget all results (tests / re-init)."""
+    for task in _tasks.values():
+        task.cancel()
+    _tasks.clear()
+    _results.clear()
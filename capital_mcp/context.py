@@ -5,29 +5,196 @@ which fits an MCP server (a single process). We hold one lazily-constructed
 CapitalComApp. Construction does NOT log in — login happens lazily per tool via
 app.session.ensure_logged_in(). The FastMCP lifespan closes the shared HTTP
 client on shutdown.
+
+The SDK's shared httpx client is created with httpx's default pool; on first
+use we swap in one with a larger keep-alive pool and HTTP/2, so concurrent tool
+calls multiplex over warm TLS connections instead of re-handshaking. Logins are
+single-flighted the same way: tool calls that find the session expired at the
+same moment share one POST /session (and concurrent pings one GET /ping).
+
+Optionally (CAP_MCP_SESSION_KEEPALIVE) the lifespan pings an idle session
+before the broker drops it, so the first call after a quiet spell does not pay
+for a fresh login.
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
 from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+import httpx
+from capital_cli import __version__ as sdk_version
 from capital_cli.sdk import CapitalComApp
 
+from . import confirmations
+from .cache import SingleFlight
+
 if TYPE_CHECKING:
     from fastmcp import FastMCP
 
+logger = logging.getLogger(__name__)
+
 _app: CapitalComApp | None = None
 
 
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Int of at least ``minimum`` from the environment (like CAP_MCP_PORT in cli.py)."""
+    raw = os.environ.get(name)
+    return max(minimum, int(raw)) if raw else default
+
+
+# Pool size for the shared client (CAP_MCP_MAX_CONNECTIONS) and the cap on
+# per-EPIC requests a single bulk tool keeps in flight (CAP_MCP_MAX_INFLIGHT).
+# Lower can be faster: fewer concurrent requests queue less at the broker.
+MAX_CONNECTIONS = _env_int("CAP_MCP_MAX_CONNECTIONS", 40)
+MAX_INFLIGHT = _env_int("CAP_MCP_MAX_INFLIGHT", 8)
+
+# Seconds a cap://market-cache/{epic} snapshot is served from memory, and how
+# much longer an expired one is still served while it refreshes in the
+# background. The latter is opt-in (default 0: expired snapshots wait for the
+# broker), since a stale snapshot would be older than its advertised ttl_s.
+MARKET_CACHE_TTL_S = _env_int("CAP_MCP_MARKET_CACHE_TTL", 30)
+MARKET_CACHE_STALE_S = _env_int("CAP_MCP_MARKET_CACHE_STALE", 0, minimum=0)
+
+# Idle seconds after which a logged-in session is pinged to keep it alive
+# (0 = off). The SDK treats a token unused for 540s as expired, so this is
+# capped just below that.
+SESSION_KEEPALIVE_S = min(_env_int("CAP_MCP_SESSION_KEEPALIVE", 0, minimum=0), 480)
+
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=min(20, MAX_CONNECTIONS),
+    max_connections=MAX_CONNECTIONS,
+    keepalive_expiry=60.0,
+)
+
+
 def get_app() -> CapitalComApp:
     """Return the process-wide CapitalComApp, building it on first use."""
     global _app
     if _app is None:
         _app = CapitalComApp()
+        _tune_http_client(_app)
+        _coalesce_session_calls(_app)
     return _app
 
 
+def _tune_http_client(app: Any) -> None:
+    """Give the SDK's shared CapitalClient an HTTP/2 httpx client with HTTP_LIMITS.
+
+    Only applies before the SDK has opened its own client. Base URL, timeout
+    and headers are built from the SDK's public config the same way its
+    default client is, so behaviour is unchanged. If any of that is missing
+    (the SDK changed), the SDK is left to build its own client.
+    """
+    client = getattr(getattr(app, "session", None), "client", None)
+    if client is None or getattr(client, "_client", True) is not None:
+        return
+    try:
+        config = client.config
+        tuned = httpx.AsyncClient(
+            base_url=config.api_base_url,
+            timeout=httpx.Timeout(config.cap_http_timeout_s),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "User-Agent": (
+                    f"capitalcom-cli/{sdk_version} "
+                    "(+https://github.com/SimonTarara62/capitalcom-cli)"
+                ),
+            },
+            limits=HTTP_LIMITS,
+            http2=True,
+        )
+    except Exception as exc:  # noqa: BLE001 - the SDK's default client still works
+        logger.debug("Keeping the SDK's default HTTP client: %s", exc)
+        return
+    client._client = tuned
+
+
+# One flight for the process: rebuilding the app must not register a new one.
+_SESSION_FLIGHT = SingleFlight()
+# Set on a session whose methods are already wrapped by _coalesce_session_calls.
+_COALESCED = "_capital_mcp_coalesced"
+
+
+def _coalesce_session_calls(app: Any) -> None:
+    """Share one in-flight login (or ping) between concurrent callers.
+
+    On an expired token the SDK's ensure_logged_in() calls login(force=True),
+    which skips the "still valid" recheck under its lock, so N tool calls that
+    hit expiry together POST /session N times in a row. The same holds for the
+    HTTP client's re-login on a 401. Both entry points are wrapped on the
+    session singleton (which every SDK service uses) so overlapping calls await
+    the first one's login instead. A still-valid token skips the flight and
+    calls the SDK directly. Concurrent pings (cap_session_ping, the keep-alive)
+    share one GET /ping the same way.
+
+    The session outlives the app (reset_app() only drops our reference), so
+    it is wrapped once: wrapping a wrapper would make the outer flight wait
+    on the inner one under the same key, forever.
+    """
+    session = getattr(app, "session", None)
+    if session is None or getattr(session, _COALESCED, False):
+        return
+    setattr(session, _COALESCED, True)
+    ensure = getattr(session, "ensure_logged_in", None)
+    if ensure is not None:
+
+        async def ensure_logged_in() -> None:
+            tokens = getattr(session, "tokens", None)
+            if tokens is not None and not tokens.is_expired():
+                await ensure()  # no login needed: no task, no flight
+                return
+            await _SESSION_FLIGHT.do("ensure", ensure)
+
+        session.ensure_logged_in = ensure_logged_in
+
+    relogin = getattr(session, "_force_relogin", None)
+    client = getattr(session, "client", None)
+    if relogin is not None and client is not None and hasattr(client, "set_relogin"):
+
+        async def force_relogin() -> None:
+            await _SESSION_FLIGHT.do("relogin", relogin)
+
+        client.set_relogin(force_relogin)
+
+    ping = getattr(session, "ping", None)
+    if ping is not None:
+
+        async def coalesced_ping() -> dict[str, Any]:
+            return await _SESSION_FLIGHT.do("ping", ping)
+
+        session.ping = coalesced_ping
+
+
+async def _ping_if_idle(app: Any, idle_s: float) -> bool:
+    """Ping the broker if the app's live session has been unused for ``idle_s``.
+
+    Never logs in: no session (or an already-expired one) is left alone.
+    """
+    tokens = getattr(app.session, "tokens", None)
+    if tokens is None or tokens.is_expired():
+        return False
+    if not tokens.is_expired(max_age_seconds=int(idle_s)):
+        return False
+    try:
+        await app.session.ping()
+    except Exception as exc:  # noqa: BLE001 - the next tool call logs in as usual
+        logger.debug("Session keep-alive ping failed: %s", exc)
+        return False
+    return True
+
+
+async def _keep_session_alive(idle_s: float) -> None:
+    while True:
+        await asyncio.sleep(min(idle_s, 60))
+        if _app is not None:
+            await _ping_if_idle(_app, idle_s)
+
+
 def reset_app() -> None:
     """Drop the cached app (tests / re-init)."""
     global _app
@@ -48,9 +215,19 @@ async def lifespan(_server: FastMCP):
     We also do NOT log out on shutdown so the cached session token can be
     reused by the next process (the SDK persists it to a 0600 state file).
     """
+    keepalive = (
+        asyncio.create_task(_keep_session_alive(SESSION_KEEPALIVE_S))
+        if SESSION_KEEPALIVE_S
+        else None
+    )
     try:
         yield
     finally:
+        if keepalive is not None:
+            keepalive.cancel()
+            await asyncio.gather(keepalive, return_exceptions=True)
+        # Background confirmation polls must not outlive the HTTP client.
+        await confirmations.aclose()
         global _app
         if _app is not None:
             # CapitalComApp.__aexit__ closes the shared httpx client (no logout).
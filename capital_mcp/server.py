@@ -5,21 +5,39 @@ SDK; this module only maps MCP tools/resources/prompts onto SDK calls.
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import functools
+import hashlib
 import json
 import logging
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
+from itertools import islice
 from typing import Any
 
+from capital_cli.core.errors import ConfirmRequiredError, DryRunError
 from capital_cli.core.models import (
     Direction,
     PreviewPositionRequest,
     PreviewWorkingOrderRequest,
+    PriceResolution,
     WorkingOrderType,
 )
-from capital_cli.services.confirmations import get_confirmation, wait_for_confirmation
+from capital_cli.core.utils import poll_until
+from capital_cli.services.confirmations import get_confirmation
 from fastmcp import FastMCP
 
-from .context import get_app, lifespan
+from . import __version__, candles, confirmations
+from .cache import SingleFlight, TTLCache
+from .context import (
+    MARKET_CACHE_STALE_S,
+    MARKET_CACHE_TTL_S,
+    MAX_INFLIGHT,
+    get_app,
+    lifespan,
+)
 from .serialization import preview_to_dict
 
 logger = logging.getLogger(__name__)
@@ -31,13 +49,16 @@ Capital.com trading + market-data server (built on the capitalcom-cli SDK).
 
 WHAT YOU CAN DO
 - Markets: cap_market_search (find an EPIC by name) -> cap_market_get (dealing
-  rules, min/max size, current bid/offer) -> cap_market_prices (historical OHLC)
-  / cap_market_sentiment (long-vs-short %) / cap_market_navigation_root +
-  cap_market_navigation_node (browse the category tree).
+  rules, min/max size, current bid/offer) -> cap_market_prices (historical OHLC;
+  cap_market_prices_batch for many EPICs in one call) / cap_market_sentiment
+  (long-vs-short %) / cap_market_navigation_root + cap_market_navigation_node
+  (browse the category tree). Identical market reads issued at the same time
+  are coalesced server-side, so there is no need to de-duplicate them yourself.
 - Account: cap_account_list, cap_account_preferences_get/set,
   cap_account_history_activity/transactions, cap_account_demo_topup (demo only),
   cap_session_switch_account (change the active account).
-- Watchlists: cap_watchlists_list/get/create/add_market/remove_market/delete.
+- Watchlists: cap_watchlists_list/get/create/add_market/remove_market/delete,
+  plus cap_watchlists_add_markets/remove_markets for many EPICs at once.
 - Positions/orders (read): cap_trade_positions_list/get, cap_trade_orders_list.
 - Live data (WebSocket; needs CAP_WS_ENABLED): cap_stream_prices (ticks),
   cap_stream_candles (OHLC bars), cap_stream_alerts (price-level crossings),
@@ -56,7 +77,10 @@ HOW TO TRADE — ALWAYS TWO PHASES, NEVER SKIP THE PREVIEW
    exit. All mutations need confirm=true.
 4. CONFIRM: execute/close/cancel can wait for confirmation (wait_for_confirm).
    To poll separately use cap_trade_confirm_get (one-shot) or
-   cap_trade_confirm_wait (until ACCEPTED/REJECTED). A {"status":"TIMEOUT"}
+   cap_trade_confirm_wait (until ACCEPTED/REJECTED). With wait_for_confirm=false
+   the server keeps polling in the background, so a later cap_trade_confirm_get
+   returns the settled result without another broker call. After several
+   no-wait executions, cap_trade_confirm_collect waits for all of them at once. A {"status":"TIMEOUT"}
    result is AMBIGUOUS — the order may have landed; reconcile with
    cap_trade_positions_list / cap_trade_orders_list before retrying. Never blindly
    re-run an execute/close/cancel on TIMEOUT (there is no broker idempotency key).
@@ -72,10 +96,61 @@ SAFETY (enforced server-side by the SDK risk engine — do not try to bypass)
 mcp = FastMCP("Capital.com MCP (unofficial)", instructions=INSTRUCTIONS, lifespan=lifespan)
 
 
-def _version() -> str:
-    from capital_mcp import __version__
+def _check_mutation_guards(app: Any, confirm: bool) -> None:
+    """Fail fast on the SDK's dry-run / explicit-confirm gates, before any login.
+
+    Mirrors RiskEngine.validate_mutation_guards (same order, same errors), which
+    the SDK only runs after ensure_logged_in() — a forgotten confirm=true would
+    otherwise cost a login round-trip before being rejected.
+    """
+    policy = app.risk_policy
+    if policy.dry_run:
+        raise DryRunError()
+    if policy.require_explicit_confirm and not confirm:
+        raise ConfirmRequiredError()
 
-    return __version__
+
+def _track_confirmation(
+    data: dict[str, Any], wait_for_confirm: bool, timeout_s: float
+) -> dict[str, Any]:
+    """Keep polling for a not-waited-for confirmation in the background.
+
+    Inline confirmations are not remembered: the SDK has already rewritten
+    their ``status``, and the cache holds broker payloads verbatim.
+    """
+    deal_reference = data.get("dealReference")
+    if not wait_for_confirm and deal_reference:
+        confirmations.track(
+            deal_reference,
+            lambda: _poll_confirmation(deal_reference, timeout_s=timeout_s),
+        )
+    return data
+
+
+async def _poll_confirmation(
+    deal_reference: str, *, timeout_s: float, poll_interval_ms: int = 500
+) -> dict[str, Any]:
+    """Poll /confirms until ACCEPTED/REJECTED and return the broker payload verbatim.
+
+    The SDK's wait_for_confirmation() loop without its ``status`` rewrite, so
+    the result can be remembered and served to cap_trade_confirm_get as is.
+    """
+    result = await poll_until(
+        lambda: get_confirmation(deal_reference),
+        lambda data: data.get("dealStatus") in confirmations.TERMINAL_STATUSES,
+        timeout_s=timeout_s,
+        poll_interval_ms=poll_interval_ms,
+    )
+    if result is None:
+        return {"status": "TIMEOUT", "message": f"Confirmation timed out after {timeout_s}s"}
+    return result
+
+
+def _normalized(confirmation: dict[str, Any]) -> dict[str, Any]:
+    """Apply wait_for_confirmation()'s contract: ``status`` mirrors ``dealStatus``."""
+    if "dealStatus" in confirmation:
+        return {**confirmation, "status": confirmation["dealStatus"]}
+    return confirmation
 
 
 # ============================================================
@@ -127,6 +202,16 @@ async def cap_session_switch_account(account_id: str) -> dict[str, Any]:
 # Market data tools
 # ============================================================
 
+# Capital.com accepts at most 50 EPICs per GET /markets request.
+_EPICS_PER_REQUEST = 50
+
+# The category tree changes rarely; serve repeat browsing from memory.
+_NAVIGATION_CACHE = TTLCache(ttl_s=300)
+
+# Identical market reads in flight at the same time (e.g. a scan and a position
+# review both asking for GOLD) share one broker request.
+_MARKET_READS = SingleFlight()
+
 
 @mcp.tool()
 async def cap_market_search(
@@ -135,8 +220,23 @@ async def cap_market_search(
     limit: int = 50,
 ) -> dict[str, Any]:
     """Search markets by term or EPIC list. limit truncates results client-side."""
+    if limit < 1:
+        return {"error": "Invalid limit", "message": f"limit must be at least 1 (got {limit})."}
     app = get_app()
-    await app.session.ensure_logged_in()
+    if epics:
+        # Each EPIC matches at most one market: never ask for more than limit.
+        epics = list(dict.fromkeys(epics))[:limit]
+    if epics and len(epics) > _EPICS_PER_REQUEST:
+        # Only reachable with limit > 50: the list is split into broker-sized
+        # chunks fetched concurrently, and the pages are merged into one reply.
+        chunks = [
+            epics[i : i + _EPICS_PER_REQUEST] for i in range(0, len(epics), _EPICS_PER_REQUEST)
+        ]
+        pages = await asyncio.gather(
+            *(app.markets.search(search_term, epics=",".join(c), limit=limit) for c in chunks)
+        )
+        markets = [m for page in pages for m in page.get("markets", [])]
+        return {**pages[0], "markets": markets[:limit]}
     epics_param = ",".join(epics) if epics else None
     return await app.markets.search(search_term, epics=epics_param, limit=limit)
 
@@ -145,24 +245,23 @@ async def cap_market_search(
 async def cap_market_get(epic: str) -> dict[str, Any]:
     """Get full market details and dealing rules for an EPIC."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.markets.get(epic)
+    return await _MARKET_READS.do(("get", epic), lambda: app.markets.get(epic))
 
 
 @mcp.tool()
 async def cap_market_navigation_root() -> dict[str, Any]:
-    """Get the root market-navigation tree (categories)."""
+    """Get the root market-navigation tree (categories). Cached for 5 minutes."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.markets.navigation_root()
+    return await _NAVIGATION_CACHE.get_or_load("root", app.markets.navigation_root)
 
 
 @mcp.tool()
 async def cap_market_navigation_node(node_id: str) -> dict[str, Any]:
-    """Get child nodes/markets under a navigation node."""
+    """Get child nodes/markets under a navigation node. Cached for 5 minutes."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.markets.navigation_node(node_id)
+    return await _NAVIGATION_CACHE.get_or_load(
+        ("node", node_id), lambda: app.markets.navigation_node(node_id)
+    )
 
 
 @mcp.tool()
@@ -174,19 +273,64 @@ async def cap_market_prices(
     to_date: str | None = None,
 ) -> dict[str, Any]:
     """Get historical OHLC candles. resolution e.g. MINUTE_15, HOUR, DAY."""
-    app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.markets.prices(
-        epic, resolution=resolution, max_candles=max, from_date=from_date, to_date=to_date
+    return await _fetch_prices(get_app(), epic, resolution, max, from_date, to_date)
+
+
+async def _fetch_prices(
+    app: Any, epic: str, resolution: str, max: int, from_date: str | None, to_date: str | None
+) -> dict[str, Any]:
+    """Latest-N reads go through the rolling candle window; date ranges hit the broker.
+
+    Identical concurrent reads are coalesced into one.
+    """
+    if from_date is None and to_date is None:
+        return await _MARKET_READS.do(
+            ("prices", epic, resolution, max),
+            lambda: candles.prices(app.markets.prices, epic, resolution, max),
+        )
+    return await _MARKET_READS.do(
+        ("prices", epic, resolution, max, from_date, to_date),
+        lambda: app.markets.prices(
+            epic, resolution=resolution, max_candles=max, from_date=from_date, to_date=to_date
+        ),
     )
 
 
+@mcp.tool()
+async def cap_market_prices_batch(
+    epics: list[str],
+    resolution: str = "MINUTE_15",
+    max: int = 200,
+    from_date: str | None = None,
+    to_date: str | None = None,
+) -> dict[str, Any]:
+    """Get OHLC candles for several EPICs concurrently. Returns {prices:{epic:...}, failed:[...]}."""
+    app = get_app()
+    unique = list(dict.fromkeys(epics))
+    sem = asyncio.Semaphore(MAX_INFLIGHT)
+
+    async def one(epic: str) -> dict[str, Any]:
+        async with sem:
+            return await _fetch_prices(app, epic, resolution, max, from_date, to_date)
+
+    results = await asyncio.gather(*(one(e) for e in unique), return_exceptions=True)
+    prices: dict[str, Any] = {}
+    failed: list[dict[str, str]] = []
+    for epic, result in zip(unique, results, strict=True):
+        if isinstance(result, Exception):
+            failed.append({"epic": epic, "error": str(result)})
+        else:
+            prices[epic] = result
+    return {"prices": prices, "failed": failed}
+
+
 @mcp.tool()
 async def cap_market_sentiment(market_id: str) -> dict[str, Any]:
     """Get client sentiment (long vs short %) for a market."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.markets.sentiment([market_id])
+    return await _MARKET_READS.do(
+        ("sentiment", market_id), lambda: app.markets.sentiment([market_id])
+    )
 
 
 # ============================================================
@@ -198,7 +342,6 @@ async def cap_market_sentiment(market_id: str) -> dict[str, Any]:
 async def cap_account_list() -> dict[str, Any]:
     """List all trading accounts (balance, currency, type). Requires authentication."""
     app = get_app()
-    await app.session.ensure_logged_in()
     data = await app.accounts.list()
     data["active_account_id"] = app.session.get_status().account_id
     return data
@@ -208,7 +351,6 @@ async def cap_account_list() -> dict[str, Any]:
 async def cap_account_preferences_get() -> dict[str, Any]:
     """Get account preferences (hedging mode, per-asset-class leverage)."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.accounts.get_preferences()
 
 
@@ -220,7 +362,7 @@ async def cap_account_preferences_set(
 ) -> dict[str, Any]:
     """Set account preferences (TRADE-GATED). Requires confirm=true when configured."""
     app = get_app()
-    await app.session.ensure_logged_in()
+    _check_mutation_guards(app, confirm)
     return await app.accounts.set_preferences(
         hedging=hedging_mode, leverages=leverages, confirm=confirm
     )
@@ -236,7 +378,6 @@ async def cap_account_history_activity(
 ) -> dict[str, Any]:
     """Get account activity history (deals, orders, updates). detailed adds fields; deal_id filters."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.accounts.history_activity(
         last_period=last_period,
         from_date=from_date,
@@ -255,7 +396,6 @@ async def cap_account_history_transactions(
 ) -> dict[str, Any]:
     """Get transaction history (deposits, withdrawals, P&L). Optional type filter."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.accounts.history_transactions(
         last_period=last_period, type_=type, from_date=from_date, to_date=to_date
     )
@@ -265,7 +405,6 @@ async def cap_account_history_transactions(
 async def cap_account_demo_topup(amount: float, confirm: bool = False) -> dict[str, Any]:
     """Top up the demo account balance (DEMO ONLY). The SDK enforces demo + confirm."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.accounts.demo_topup(amount, confirm=confirm)
 
 
@@ -278,7 +417,6 @@ async def cap_account_demo_topup(amount: float, confirm: bool = False) -> dict[s
 async def cap_trade_positions_list() -> dict[str, Any]:
     """List all open positions (P&L, direction, size, attached orders)."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.trading.list_positions()
 
 
@@ -286,7 +424,6 @@ async def cap_trade_positions_list() -> dict[str, Any]:
 async def cap_trade_positions_get(deal_id: str) -> dict[str, Any]:
     """Get a single position's details by deal ID."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.trading.get_position(deal_id)
 
 
@@ -294,15 +431,19 @@ async def cap_trade_positions_get(deal_id: str) -> dict[str, Any]:
 async def cap_trade_orders_list() -> dict[str, Any]:
     """List all working orders (pending LIMIT/STOP that haven't triggered)."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.trading.list_orders()
 
 
 @mcp.tool()
 async def cap_trade_confirm_get(deal_reference: str) -> dict[str, Any]:
     """Get deal-confirmation status (ACCEPTED/REJECTED/pending) for a deal reference."""
+    settled = confirmations.lookup(deal_reference)
+    if settled is not None:
+        return settled
     await get_app().session.ensure_logged_in()
-    return await get_confirmation(deal_reference)
+    confirmation = await get_confirmation(deal_reference)
+    confirmations.remember(deal_reference, confirmation)
+    return confirmation
 
 
 @mcp.tool()
@@ -313,15 +454,73 @@ async def cap_trade_confirm_wait(
 ) -> dict[str, Any]:
     """Poll the confirmation endpoint until ACCEPTED/REJECTED or timeout."""
     await get_app().session.ensure_logged_in()
-    return await wait_for_confirmation(
-        deal_reference, timeout_s=timeout_s, poll_interval_ms=poll_interval_ms
+    return await _wait_confirmation(deal_reference, timeout_s, poll_interval_ms)
+
+
+@mcp.tool()
+async def cap_trade_confirm_collect(
+    deal_references: list[str],
+    timeout_s: float = 15.0,
+    poll_interval_ms: int = 500,
+) -> dict[str, Any]:
+    """Wait for several deal confirmations concurrently; results keyed by deal reference."""
+    await get_app().session.ensure_logged_in()
+    refs = list(dict.fromkeys(deal_references))
+    results = await asyncio.gather(
+        *(_wait_confirmation(ref, timeout_s, poll_interval_ms) for ref in refs),
+        return_exceptions=True,
+    )
+    return {
+        "confirmations": {
+            ref: (
+                {"status": "ERROR", "message": str(result)}
+                if isinstance(result, Exception)
+                else result
+            )
+            for ref, result in zip(refs, results, strict=True)
+        }
+    }
+
+
+async def _wait_confirmation(
+    deal_reference: str, timeout_s: float, poll_interval_ms: int
+) -> dict[str, Any]:
+    confirmation = await confirmations.wait(
+        deal_reference,
+        lambda window: _poll_confirmation(
+            deal_reference, timeout_s=window, poll_interval_ms=poll_interval_ms
+        ),
+        timeout_s=timeout_s,
     )
+    return _normalized(confirmation)
 
 
 # ============================================================
 # Trading tools — preview (no side effects)
 # ============================================================
 
+# preview_id -> normalized request of passing previews, so the execute tools can
+# echo the requested stops/targets without a follow-up positions lookup.
+_PREVIEW_REQUESTS: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_MAX_PREVIEW_REQUESTS = 256
+
+
+def _remember_preview(preview: Any) -> None:
+    if not preview.all_checks_passed:
+        return
+    _PREVIEW_REQUESTS[preview.preview_id] = preview.normalized_request
+    _PREVIEW_REQUESTS.move_to_end(preview.preview_id)
+    while len(_PREVIEW_REQUESTS) > _MAX_PREVIEW_REQUESTS:
+        _PREVIEW_REQUESTS.popitem(last=False)
+
+
+def _attach_requested(data: dict[str, Any], preview_id: str) -> dict[str, Any]:
+    """Add the previewed request (epic, size, stop/profit levels, ...) as `requested`."""
+    requested = _PREVIEW_REQUESTS.get(preview_id)
+    if requested:
+        data["requested"] = {k: v for k, v in requested.items() if v is not None}
+    return data
+
 
 @mcp.tool()
 async def cap_trade_preview_position(
@@ -339,7 +538,6 @@ async def cap_trade_preview_position(
 ) -> dict[str, Any]:
     """Preview a position (NO SIDE EFFECTS). Runs the full risk pipeline; returns preview_id."""
     app = get_app()
-    await app.session.ensure_logged_in()
     request = PreviewPositionRequest(
         epic=epic,
         direction=Direction(direction.upper()),
@@ -354,6 +552,7 @@ async def cap_trade_preview_position(
         profit_amount=profit_amount,
     )
     preview = await app.trading.preview_position(request)
+    _remember_preview(preview)
     return preview_to_dict(preview)
 
 
@@ -376,7 +575,6 @@ async def cap_trade_preview_working_order(
 ) -> dict[str, Any]:
     """Preview a working order (NO SIDE EFFECTS). type is LIMIT or STOP. Returns preview_id."""
     app = get_app()
-    await app.session.ensure_logged_in()
     request = PreviewWorkingOrderRequest(
         epic=epic,
         direction=Direction(direction.upper()),
@@ -394,6 +592,7 @@ async def cap_trade_preview_working_order(
         good_till_date=good_till_date,
     )
     preview = await app.trading.preview_working_order(request)
+    _remember_preview(preview)
     return preview_to_dict(preview)
 
 
@@ -411,10 +610,11 @@ async def cap_trade_execute_position(
 ) -> dict[str, Any]:
     """Execute a previewed position (CREATES A REAL TRADE). SDK enforces all safety gates."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.trading.execute_position(
+    data = await app.trading.execute_position(
         preview_id, confirm=confirm, wait=wait_for_confirm, timeout_s=timeout_s
     )
+    _attach_requested(data, preview_id)
+    return _track_confirmation(data, wait_for_confirm, timeout_s)
 
 
 @mcp.tool()
@@ -426,10 +626,11 @@ async def cap_trade_execute_working_order(
 ) -> dict[str, Any]:
     """Execute a previewed working order (CREATES A REAL ORDER). SDK enforces all safety gates."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.trading.execute_working_order(
+    data = await app.trading.execute_working_order(
         preview_id, confirm=confirm, wait=wait_for_confirm, timeout_s=timeout_s
     )
+    _attach_requested(data, preview_id)
+    return _track_confirmation(data, wait_for_confirm, timeout_s)
 
 
 @mcp.tool()
@@ -441,10 +642,10 @@ async def cap_trade_positions_close(
 ) -> dict[str, Any]:
     """Close an open position (SIDE EFFECT). Requires confirm + trading enabled."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.trading.close_position(
+    data = await app.trading.close_position(
         deal_id, confirm=confirm, wait=wait_for_confirm, timeout_s=timeout_s
     )
+    return _track_confirmation(data, wait_for_confirm, timeout_s)
 
 
 @mcp.tool()
@@ -456,16 +657,39 @@ async def cap_trade_orders_cancel(
 ) -> dict[str, Any]:
     """Cancel a working order (SIDE EFFECT). Requires confirm + trading enabled."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    return await app.trading.cancel_order(
+    data = await app.trading.cancel_order(
         deal_id, confirm=confirm, wait=wait_for_confirm, timeout_s=timeout_s
     )
+    return _track_confirmation(data, wait_for_confirm, timeout_s)
 
 
 # ============================================================
 # Trading tools — amend (side effects, guarded by the SDK)
 # ============================================================
 
+# Broker field names, in the same order as the amend tools' parameters.
+_POSITION_AMEND_FIELDS = (
+    "stopLevel",
+    "stopDistance",
+    "profitLevel",
+    "profitDistance",
+    "guaranteedStop",
+    "trailingStop",
+)
+_ORDER_AMEND_FIELDS = (
+    "level",
+    "stopLevel",
+    "stopDistance",
+    "profitLevel",
+    "profitDistance",
+    "goodTillDate",
+)
+
+
+def _amend_body(fields: tuple[str, ...], values: tuple[Any, ...]) -> dict[str, Any]:
+    """Build a partial-update body from the arguments that were actually set."""
+    return {field: value for field, value in zip(fields, values, strict=True) if value is not None}
+
 
 @mcp.tool()
 async def cap_trade_positions_amend(
@@ -482,23 +706,14 @@ async def cap_trade_positions_amend(
 ) -> dict[str, Any]:
     """Amend stop-loss / take-profit on an open position (SIDE EFFECT). Requires confirm."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    body: dict[str, Any] = {}
-    if stop_level is not None:
-        body["stopLevel"] = stop_level
-    if stop_distance is not None:
-        body["stopDistance"] = stop_distance
-    if profit_level is not None:
-        body["profitLevel"] = profit_level
-    if profit_distance is not None:
-        body["profitDistance"] = profit_distance
-    if guaranteed_stop is not None:
-        body["guaranteedStop"] = guaranteed_stop
-    if trailing_stop is not None:
-        body["trailingStop"] = trailing_stop
-    return await app.trading.amend_position(
+    body = _amend_body(
+        _POSITION_AMEND_FIELDS,
+        (stop_level, stop_distance, profit_level, profit_distance, guaranteed_stop, trailing_stop),
+    )
+    data = await app.trading.amend_position(
         deal_id, body=body, confirm=confirm, wait=wait_for_confirm, timeout_s=timeout_s
     )
+    return _track_confirmation(data, wait_for_confirm, timeout_s)
 
 
 @mcp.tool()
@@ -516,23 +731,14 @@ async def cap_trade_orders_amend(
 ) -> dict[str, Any]:
     """Amend a working order's level/expiry/stops-limits (SIDE EFFECT). Requires confirm."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    body: dict[str, Any] = {}
-    if level is not None:
-        body["level"] = level
-    if stop_level is not None:
-        body["stopLevel"] = stop_level
-    if stop_distance is not None:
-        body["stopDistance"] = stop_distance
-    if profit_level is not None:
-        body["profitLevel"] = profit_level
-    if profit_distance is not None:
-        body["profitDistance"] = profit_distance
-    if good_till_date is not None:
-        body["goodTillDate"] = good_till_date
-    return await app.trading.amend_order(
+    body = _amend_body(
+        _ORDER_AMEND_FIELDS,
+        (level, stop_level, stop_distance, profit_level, profit_distance, good_till_date),
+    )
+    data = await app.trading.amend_order(
         deal_id, body=body, confirm=confirm, wait=wait_for_confirm, timeout_s=timeout_s
     )
+    return _track_confirmation(data, wait_for_confirm, timeout_s)
 
 
 # ============================================================
@@ -544,7 +750,6 @@ async def cap_trade_orders_amend(
 async def cap_watchlists_list() -> dict[str, Any]:
     """List all watchlists (IDs and names)."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.watchlists.list()
 
 
@@ -552,7 +757,6 @@ async def cap_watchlists_list() -> dict[str, Any]:
 async def cap_watchlists_get(watchlist_id: str) -> dict[str, Any]:
     """Get a watchlist's details including its markets."""
     app = get_app()
-    await app.session.ensure_logged_in()
     return await app.watchlists.get(watchlist_id)
 
 
@@ -560,7 +764,7 @@ async def cap_watchlists_get(watchlist_id: str) -> dict[str, Any]:
 async def cap_watchlists_create(name: str, confirm: bool = False) -> dict[str, Any]:
     """Create a new watchlist (1-100 chars). Requires confirm when configured."""
     app = get_app()
-    await app.session.ensure_logged_in()
+    _check_mutation_guards(app, confirm)
     return await app.watchlists.create(name, confirm=confirm)
 
 
@@ -570,7 +774,7 @@ async def cap_watchlists_add_market(
 ) -> dict[str, Any]:
     """Add a market (EPIC) to a watchlist. Requires confirm when configured."""
     app = get_app()
-    await app.session.ensure_logged_in()
+    _check_mutation_guards(app, confirm)
     return await app.watchlists.add_market(watchlist_id, epic, confirm=confirm)
 
 
@@ -580,15 +784,60 @@ async def cap_watchlists_remove_market(
 ) -> dict[str, Any]:
     """Remove a market (EPIC) from a watchlist. Requires confirm when configured."""
     app = get_app()
-    await app.session.ensure_logged_in()
+    _check_mutation_guards(app, confirm)
     return await app.watchlists.remove_market(watchlist_id, epic, confirm=confirm)
 
 
+@mcp.tool()
+async def cap_watchlists_add_markets(
+    watchlist_id: str, epics: list[str], confirm: bool = False
+) -> dict[str, Any]:
+    """Add several markets (EPICs) to a watchlist concurrently. Requires confirm when configured."""
+    app = get_app()
+    _check_mutation_guards(app, confirm)
+    ok, failed = await _watchlist_bulk(app.watchlists.add_market, watchlist_id, epics, confirm)
+    return {"watchlist_id": watchlist_id, "added": ok, "failed": failed}
+
+
+@mcp.tool()
+async def cap_watchlists_remove_markets(
+    watchlist_id: str, epics: list[str], confirm: bool = False
+) -> dict[str, Any]:
+    """Remove several markets (EPICs) from a watchlist concurrently. Requires confirm when configured."""
+    app = get_app()
+    _check_mutation_guards(app, confirm)
+    ok, failed = await _watchlist_bulk(
+        app.watchlists.remove_market, watchlist_id, epics, confirm
+    )
+    return {"watchlist_id": watchlist_id, "removed": ok, "failed": failed}
+
+
+async def _watchlist_bulk(
+    op: Any, watchlist_id: str, epics: list[str], confirm: bool
+) -> tuple[list[str], list[dict[str, str]]]:
+    """Apply a per-EPIC watchlist op with bounded concurrency; split successes/failures."""
+    unique = list(dict.fromkeys(epics))
+    sem = asyncio.Semaphore(MAX_INFLIGHT)
+
+    async def one(epic: str) -> Any:
+        async with sem:
+            return await op(watchlist_id, epic, confirm=confirm)
+
+    results = await asyncio.gather(*(one(e) for e in unique), return_exceptions=True)
+    ok = [e for e, r in zip(unique, results, strict=True) if not isinstance(r, Exception)]
+    failed = [
+        {"epic": e, "error": str(r)}
+        for e, r in zip(unique, results, strict=True)
+        if isinstance(r, Exception)
+    ]
+    return ok, failed
+
+
 @mcp.tool()
 async def cap_watchlists_delete(watchlist_id: str, confirm: bool = False) -> dict[str, Any]:
     """Delete a watchlist. Requires confirm when configured."""
     app = get_app()
-    await app.session.ensure_logged_in()
+    _check_mutation_guards(app, confirm)
     return await app.watchlists.delete(watchlist_id, confirm=confirm)
 
 
@@ -596,6 +845,9 @@ async def cap_watchlists_delete(watchlist_id: str, confirm: bool = False) -> dic
 # Streaming tools (WebSocket; engine via app.stream)
 # ============================================================
 
+# How many of the most recent ticks/bars a stream tool returns.
+_STREAM_KEEP = 100
+
 
 @mcp.tool()
 async def cap_stream_prices(
@@ -614,23 +866,26 @@ async def cap_stream_prices(
         }
     app = get_app()
     await app.session.ensure_logged_in()
-    ticks: list[dict[str, Any]] = []
-    last = datetime.now(timezone.utc)
+    # Only the newest _STREAM_KEEP items are returned; the deque drops older ones.
+    ticks: deque[dict[str, Any]] = deque(maxlen=_STREAM_KEEP)
+    received = 0
+    last = time.monotonic()
     try:
         async for tick in app.stream.prices(epics, duration=duration_s):
-            now = datetime.now(timezone.utc)
-            if (now - last).total_seconds() >= update_interval_s:
+            now = time.monotonic()
+            if now - last >= update_interval_s:
                 ticks.append(tick.model_dump())
+                received += 1
                 last = now
         return {
             "status": "completed",
             "epics_monitored": epics,
             "duration_s": duration_s,
-            "ticks_received": len(ticks),
-            "ticks": ticks[-100:],
+            "ticks_received": received,
+            "ticks": list(ticks),
         }
     except Exception as e:  # surface streaming errors as data
-        return {"error": "Streaming failed", "message": str(e), "ticks_before_error": len(ticks)}
+        return {"error": "Streaming failed", "message": str(e), "ticks_before_error": received}
 
 
 @mcp.tool()
@@ -657,25 +912,27 @@ async def cap_stream_candles(
         return {"error": "No resolutions provided", "message": "Specify at least one resolution."}
     app = get_app()
     await app.session.ensure_logged_in()
-    bars: list[dict[str, Any]] = []
-    last = datetime.now(timezone.utc)
+    bars: deque[dict[str, Any]] = deque(maxlen=_STREAM_KEEP)
+    received = 0
+    last = time.monotonic()
     try:
         async for bar in app.stream.candles(
             epics, resolutions, bar_type=bar_type, duration=duration_s
         ):
-            now = datetime.now(timezone.utc)
-            if (now - last).total_seconds() >= update_interval_s:
+            now = time.monotonic()
+            if now - last >= update_interval_s:
                 bars.append(bar.model_dump())
+                received += 1
                 last = now
         return {
             "status": "completed",
             "epics_monitored": epics,
             "resolutions": resolutions,
-            "bars_received": len(bars),
-            "bars": bars[-100:],
+            "bars_received": received,
+            "bars": list(bars),
         }
     except Exception as e:  # noqa: BLE001
-        return {"error": "Streaming failed", "message": str(e), "bars_before_error": len(bars)}
+        return {"error": "Streaming failed", "message": str(e), "bars_before_error": received}
 
 
 @mcp.tool()
@@ -687,41 +944,65 @@ async def cap_stream_alerts(
     """Monitor EPICs for price-level crossings. alerts: {EPIC: {level, direction: ABOVE|BELOW}}."""
     if not alerts:
         return {"error": "No alerts configured", "message": "Specify at least one alert."}
-    epics = list(alerts.keys())
-    if len(epics) > 40:
-        return {"error": "Too many alerts", "message": f"Max 40 (requested: {len(epics)})."}
+    if len(alerts) > 40:
+        return {"error": "Too many alerts", "message": f"Max 40 (requested: {len(alerts)})."}
+    # Parse each alert once: EPIC -> (level, 2 * level, is_above). Comparing
+    # bid + offer against the doubled level avoids a division per tick.
+    # Alerts that cannot fire (empty, unknown direction, bad level) are rejected.
+    compiled: dict[str, tuple[float, float, bool]] = {}
+    rejected: list[dict[str, Any]] = []
+    for epic, cfg in alerts.items():
+        try:
+            direction = str(cfg["direction"]).upper() if cfg else ""
+            if direction not in ("ABOVE", "BELOW"):
+                raise ValueError("direction must be ABOVE or BELOW")
+            level = float(cfg["level"])
+        except (KeyError, TypeError, ValueError) as e:
+            error = f"missing {e}" if isinstance(e, KeyError) else str(e)
+            rejected.append({"epic": epic, "error": error})
+            continue
+        compiled[epic] = (level, 2 * level, direction == "ABOVE")
+    if not compiled:
+        # Nothing can fire: don't log in or stream for the whole duration.
+        return {
+            "error": "No valid alerts",
+            "message": "Each alert needs a numeric level and direction ABOVE or BELOW.",
+            "rejected_alerts": rejected,
+            "triggered_alerts": [],
+        }
     app = get_app()
     await app.session.ensure_logged_in()
     triggered: list[dict[str, Any]] = []
     triggered_epics: set[str] = set()
     try:
-        async for tick in app.stream.prices(epics, duration=duration_s):
+        # auto_close stops once every alert that can fire has fired.
+        target_count = len(compiled)
+        async for tick in app.stream.prices(list(compiled), duration=duration_s):
             if auto_close and tick.epic in triggered_epics:
                 continue
-            cfg = alerts.get(tick.epic)
-            if not cfg:
+            alert = compiled.get(tick.epic)
+            if alert is None:
                 continue
-            level = float(cfg["level"])
-            direction = str(cfg["direction"]).upper()
-            mid = (tick.bid + tick.offer) / 2
-            hit = (direction == "ABOVE" and mid >= level) or (direction == "BELOW" and mid <= level)
-            if hit:
+            level, level2, is_above = alert
+            total = tick.bid + tick.offer
+            if total >= level2 if is_above else total <= level2:
                 triggered.append(
                     {
                         "epic": tick.epic,
-                        "condition": f"LEVEL_{direction}",
+                        "condition": "LEVEL_ABOVE" if is_above else "LEVEL_BELOW",
                         "trigger_price": level,
-                        "current_price": mid,
+                        "current_price": total / 2,
                     }
                 )
                 triggered_epics.add(tick.epic)
-                if auto_close and len(triggered_epics) == len(epics):
+                if auto_close and len(triggered_epics) == target_count:
                     break
         return {
             "status": "completed",
             "alerts_configured": len(alerts),
             "alerts_triggered": len(triggered),
             "triggered_alerts": triggered,
+            "rejected_alerts": rejected,
             "auto_close": auto_close,
         }
     except Exception as e:  # noqa: BLE001
@@ -729,6 +1010,7 @@ async def cap_stream_alerts(
             "error": "Alert monitoring failed",
             "message": str(e),
             "triggered_alerts": triggered,
+            "rejected_alerts": rejected,
         }
 
 
@@ -737,32 +1019,66 @@ async def cap_stream_portfolio(
     duration_s: float = 300.0,
     update_interval_s: float = 5.0,
 ) -> dict[str, Any]:
-    """Stream live portfolio snapshots for open positions for duration_s seconds (WebSocket)."""
+    """Stream live portfolio snapshots for open positions for duration_s seconds (WebSocket).
+
+    Each position row carries the latest mid price and a P&L estimate
+    (size x price move from the open level, in the instrument's quote currency).
+    """
     app = get_app()
     await app.session.ensure_logged_in()
     try:
         positions = (await app.trading.list_positions()).get("positions", [])
         if not positions:
             return {"status": "no_positions", "message": "No open positions.", "positions": []}
-        epics = [p.get("market", {}).get("epic") or p.get("epic") for p in positions]
-        epics = [e for e in epics if e]
+        # Struct-of-arrays: static per-position fields once, plus a mutable mids column
+        # that ticks update in place via an EPIC -> row-indices map.
+        deal_ids: list[str | None] = []
+        pos_epics: list[str | None] = []
+        opens: list[float | None] = []
+        signed_sizes: list[float] = []
+        mids: list[float | None] = []
+        rows_by_epic: dict[str, list[int]] = {}
+        for i, p in enumerate(positions):
+            pos = p.get("position") or {}
+            market = p.get("market") or {}
+            epic = market.get("epic") or p.get("epic")
+            deal_ids.append(pos.get("dealId") or p.get("dealId"))
+            pos_epics.append(epic)
+            opens.append(_to_float(pos.get("level")))
+            size = _to_float(pos.get("size")) or 0.0
+            signed_sizes.append(-size if pos.get("direction") == "SELL" else size)
+            bid, offer = _to_float(market.get("bid")), _to_float(market.get("offer"))
+            mids.append((bid + offer) / 2 if bid is not None and offer is not None else None)
+            if epic:
+                rows_by_epic.setdefault(epic, []).append(i)
         snapshots: list[dict[str, Any]] = []
-        last = datetime.now(timezone.utc)
-        async for _tick in app.stream.portfolio(epics, duration=duration_s):
-            now = datetime.now(timezone.utc)
-            if (now - last).total_seconds() < update_interval_s:
+        last = time.monotonic()
+        async for tick in app.stream.portfolio(list(rows_by_epic), duration=duration_s):
+            mid = (tick.bid + tick.offer) / 2
+            for i in rows_by_epic.get(tick.epic, ()):
+                mids[i] = mid
+            now = time.monotonic()
+            if now - last < update_interval_s:
                 continue
             last = now
             snapshots.append(
                 {
                     "positions": [
                         {
-                            "deal_id": p.get("position", {}).get("dealId") or p.get("dealId"),
-                            "epic": p.get("market", {}).get("epic") or p.get("epic"),
+                            "deal_id": deal_id,
+                            "epic": epic,
+                            "mid": mid_,
+                            "pnl_estimate": (
+                                size * (mid_ - open_)
+                                if mid_ is not None and open_ is not None
+                                else None
+                            ),
                         }
-                        for p in positions
+                        for deal_id, epic, open_, size, mid_ in zip(
+                            deal_ids, pos_epics, opens, signed_sizes, mids, strict=True
+                        )
                     ],
-                    "timestamp": now.isoformat(),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
                 }
             )
         return {
@@ -776,76 +1092,162 @@ async def cap_stream_portfolio(
         return {"error": "Portfolio streaming failed", "message": str(e)}
 
 
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 # ============================================================
 # Resources (read-only)
 # ============================================================
 
 
+# Parts of the resource payloads that never change, built once at import.
+_SERVER_INFO = {"name": "Capital.com MCP (unofficial)", "version": __version__}
+_TWO_PHASE = {
+    "two_phase_execution": True,
+    "description": "All trades require preview -> explicit execution",
+}
+
+
+# (policy, allowed EPICs, has "ALL" wildcard) for the app's frozen RiskPolicy,
+# derived once instead of on every resource read.
+_allowlist_memo: tuple[Any, tuple[str, ...], bool] | None = None
+
+
+def _allowlist(policy: Any) -> tuple[tuple[str, ...], bool]:
+    """Return the policy's allowed EPICs and whether they include the ALL wildcard."""
+    global _allowlist_memo
+    if _allowlist_memo is None or _allowlist_memo[0] is not policy:
+        epics = tuple(policy.allowed_epics)
+        _allowlist_memo = (policy, epics, "ALL" in epics)
+    return _allowlist_memo[1], _allowlist_memo[2]
+
+
 @mcp.resource("cap://status")
 async def cap_status_resource() -> dict[str, Any]:
     """Server + session status snapshot."""
     app = get_app()
     status = app.session.get_status()
     policy = app.risk_policy
+    epics, wildcard = _allowlist(policy)
     return {
-        "server": {"name": "Capital.com MCP (unofficial)", "version": _version()},
+        "server": dict(_SERVER_INFO),  # a copy: the constant is shared across reads
         "session": status.model_dump(),
         "risk": {
             "trading_enabled": policy.allow_trading,
-            "allowed_epics": list(policy.allowed_epics),
-            "allowlist_mode": "ALL" if "ALL" in policy.allowed_epics else "SPECIFIC",
+            "allowed_epics": epics,
+            "allowlist_mode": "ALL" if wildcard else "SPECIFIC",
         },
     }
 
 
+# (policy, risk-policy payload, allowed-epics payload). Both resources are a
+# pure function of the frozen RiskPolicy, so they are built once per policy.
+# The resources hand out deep copies, so no reader can alter a later read.
+_policy_payloads_memo: tuple[Any, dict[str, Any], dict[str, Any]] | None = None
+
+
+def _policy_payloads(policy: Any) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return the memoized (risk-policy, allowed-epics) payloads for a policy."""
+    global _policy_payloads_memo
+    if _policy_payloads_memo is None or _policy_payloads_memo[0] is not policy:
+        epics, wildcard = _allowlist(policy)
+        risk_policy = {
+            "trading_enabled": policy.allow_trading,
+            **_TWO_PHASE,
+            "allowlist": {
+                "mode": "ALL" if wildcard else "SPECIFIC",
+                "epics": epics,
+            },
+            "limits": {
+                "max_position_size": policy.max_position_size,
+                "max_working_order_size": policy.max_working_order_size,
+                "max_open_positions": policy.max_open_positions,
+                "max_orders_per_day": policy.max_orders_per_day,
+            },
+            "require_explicit_confirm": policy.require_explicit_confirm,
+            "dry_run": policy.dry_run,
+        }
+        allowed_epics = {
+            "mode": "WILDCARD" if wildcard else "SPECIFIC",
+            "allowed_epics": epics,
+            "count": len(epics),
+            "trading_enabled": policy.allow_trading,
+        }
+        _policy_payloads_memo = (policy, risk_policy, allowed_epics)
+    return _policy_payloads_memo[1], _policy_payloads_memo[2]
+
+
 @mcp.resource("cap://risk-policy")
 async def cap_risk_policy_resource() -> dict[str, Any]:
     """Active risk-management policy."""
-    policy = get_app().risk_policy
-    return {
-        "trading_enabled": policy.allow_trading,
-        "two_phase_execution": True,
-        "description": "All trades require preview -> explicit execution",
-        "allowlist": {
-            "mode": "ALL" if "ALL" in policy.allowed_epics else "SPECIFIC",
-            "epics": list(policy.allowed_epics),
-        },
-        "limits": {
-            "max_position_size": policy.max_position_size,
-            "max_working_order_size": policy.max_working_order_size,
-            "max_open_positions": policy.max_open_positions,
-            "max_orders_per_day": policy.max_orders_per_day,
-        },
-        "require_explicit_confirm": policy.require_explicit_confirm,
-        "dry_run": policy.dry_run,
-    }
+    return copy.deepcopy(_policy_payloads(get_app().risk_policy)[0])
 
 
 @mcp.resource("cap://allowed-epics")
 async def cap_allowed_epics_resource() -> dict[str, Any]:
     """Trading allowlist."""
-    policy = get_app().risk_policy
-    epics = list(policy.allowed_epics)
-    has_wildcard = "ALL" in epics
-    return {
-        "mode": "WILDCARD" if has_wildcard else "SPECIFIC",
-        "allowed_epics": epics,
-        "count": len(epics),
-        "trading_enabled": policy.allow_trading,
-    }
+    return copy.deepcopy(_policy_payloads(get_app().risk_policy)[1])
+
+
+# Per-EPIC snapshots for cap://market-cache/{epic} and cap://market-cache-batch/{epics_csv};
+# concurrent misses share a load.
+_MARKET_SNAPSHOT_CACHE = TTLCache(ttl_s=MARKET_CACHE_TTL_S, stale_s=MARKET_CACHE_STALE_S)
 
 
 @mcp.resource("cap://market-cache/{epic}")
 async def cap_market_cache_resource(epic: str) -> dict[str, Any]:
-    """Live market details for an EPIC (no real cache)."""
+    """Market details for an EPIC, cached in memory for CAP_MCP_MARKET_CACHE_TTL seconds."""
+    return await _market_snapshot(get_app(), epic)
+
+
+@mcp.resource("cap://market-cache-batch/{epics_csv}")
+async def cap_market_cache_batch_resource(epics_csv: str) -> dict[str, Any]:
+    """Cached market details for comma-separated EPICs. Returns {markets:{epic:...}, failed:[...]}."""
     app = get_app()
-    await app.session.ensure_logged_in()
-    data = await app.markets.get(epic)
-    snapshot = data.get("snapshot", {})
-    instrument = data.get("instrument", {})
-    dealing = instrument.get("dealingRules", {})
+    unique = list(dict.fromkeys(e for e in (p.strip() for p in epics_csv.split(",")) if e))
+    sem = asyncio.Semaphore(MAX_INFLIGHT)
+
+    async def one(epic: str) -> dict[str, Any]:
+        async with sem:
+            return await _market_snapshot(app, epic)
+
+    results = await asyncio.gather(*(one(e) for e in unique), return_exceptions=True)
+    markets: dict[str, Any] = {}
+    failed: list[dict[str, str]] = []
+    for epic, result in zip(unique, results, strict=True):
+        if isinstance(result, Exception):
+            failed.append({"epic": epic, "error": str(result)})
+        else:
+            markets[epic] = result
+    return {"markets": markets, "failed": failed}
+
+
+async def _market_snapshot(app: Any, epic: str) -> dict[str, Any]:
+    async def load() -> tuple[str, str, dict[str, Any]]:
+        data = await app.markets.get(epic)
+        # Content hash of the broker payload: unchanged across refreshes when
+        # the market hasn't moved, so a polling client can skip re-processing.
+        etag = hashlib.blake2b(
+            json.dumps(data, sort_keys=True, default=str).encode(), digest_size=8
+        ).hexdigest()
+        return datetime.now(timezone.utc).isoformat(), etag, data
+
+    cached_at, etag, data = await _MARKET_SNAPSHOT_CACHE.get_or_load(epic, load)
+    snapshot = data.get("snapshot") or {}
+    instrument = data.get("instrument") or {}
+    dealing = instrument.get("dealingRules") or {}
+    min_size = dealing.get("minDealSize")
+    max_size = dealing.get("maxDealSize")
+    min_step = dealing.get("minStepDistance")
     return {
         "epic": epic,
+        "cached_at": cached_at,
+        "ttl_s": MARKET_CACHE_TTL_S,
+        "etag": etag,
         "instrument_name": instrument.get("name"),
         "instrument_type": instrument.get("type"),
         "snapshot": {
@@ -855,47 +1257,30 @@ async def cap_market_cache_resource(epic: str) -> dict[str, Any]:
             "update_time": snapshot.get("updateTime"),
         },
         "dealing": {
-            "min_size": dealing.get("minDealSize", {}).get("value"),
-            "max_size": dealing.get("maxDealSize", {}).get("value"),
-            "min_step": dealing.get("minStepDistance", {}).get("value"),
+            "min_size": min_size.get("value") if min_size else None,
+            "max_size": max_size.get("value") if max_size else None,
+            "min_step": min_step.get("value") if min_step else None,
         },
     }
 
 
 # ============================================================
-# Prompts (workflow guidance; return plain strings for FastMCP 3.x)
+# Prompts (workflow guidance; plain sync functions returning strings — no I/O)
 # ============================================================
+#
+# Prompt text is a pure function of the arguments, so the parameterised
+# prompts render through lru_cache'd builders: a repeated request (same EPIC,
+# same direction, ...) returns the already-built string.
 
+# Disclaimer appended to every prompt.
+_FOOTER = "\n\n---\n_Capital.com MCP — demo account recommended; this is not financial advice._"
 
-@mcp.prompt()
-async def market_scan(
-    watchlist_id: str = "",
-    timeframe: str = "HOUR",
-    lookback_periods: int = 24,
-) -> str:
-    """
-    Market scan workflow - Analyze markets in a watchlist.
-
-    This prompt guides you through scanning markets for trading opportunities.
-    It fetches a watchlist, retrieves price data for each market, and prompts
-    you to analyze the data for patterns and opportunities.
-
-    Args:
-        watchlist_id: ID of watchlist to scan (leave empty to list all watchlists first)
-        timeframe: Price resolution (MINUTE, MINUTE_5, HOUR, DAY) - default: HOUR
-        lookback_periods: Number of candles to fetch (1-1000) - default: 24
+# Valid `timeframe` values, checked before the text cache is consulted.
+_TIMEFRAMES = frozenset(r.value for r in PriceResolution)
 
-    Workflow:
-    1. If watchlist_id is empty, first call cap_watchlists_list to choose one
-    2. Call cap_watchlists_get to get markets in the watchlist
-    3. For each market, call cap_market_prices to get historical data
-    4. Analyze the price data for trading opportunities
-    5. Optionally check cap_market_sentiment for client positioning
 
-    Example usage:
-    - "Scan my watchlist for trading setups"
-    - "Analyze markets in watchlist abc123 over the last day"
-    """
+@functools.lru_cache(maxsize=256)
+def _market_scan_text(watchlist_id: str, timeframe: str, lookback_periods: int) -> str:
     if not watchlist_id:
         return (
             "# Market Scan Workflow\n\n"
@@ -907,8 +1292,7 @@ async def market_scan(
             f"- Timeframe: {timeframe}\n"
             f"- Lookback periods: {lookback_periods}\n\n"
             "After you have a watchlist ID, use this prompt again with the watchlist_id parameter."
-            "\n\n---\n"
-            "_Capital.com MCP — demo account recommended; this is not financial advice._"
+            + _FOOTER
         )
 
     return (
@@ -919,9 +1303,16 @@ async def market_scan(
         f"Call `cap_watchlists_get` with watchlist_id='{watchlist_id}' "
         "to get the list of markets.\n\n"
         "**Step 3: Fetch Price Data**\n"
-        "For each market (EPIC) in the watchlist:\n"
-        f"- Call `cap_market_prices` with resolution='{timeframe}' and max={lookback_periods}\n"
-        "- Collect OHLC data for analysis\n\n"
+        "Fetch every market in one call: `cap_market_prices_batch` with "
+        f"epics=[...all EPICs from Step 2...], resolution='{timeframe}' and "
+        f"max={lookback_periods}.\n"
+        "- Collect OHLC data per EPIC from `prices`; retry any EPIC listed in `failed`\n"
+        "- Re-running the scan is cheap: the server keeps recent candles per EPIC and "
+        "timeframe and only downloads bars newer than the last scan\n"
+        "- If the batch tool is unavailable, call `cap_market_prices` once per EPIC "
+        "with the same resolution and max. The calls are independent, so issue them "
+        f"in parallel rather than one after another, keeping at most {MAX_INFLIGHT} in flight to "
+        "stay under the broker's rate limits\n\n"
         "**Step 4: Technical Analysis**\n"
         "Analyze the price data for each market:\n"
         "- Identify trends (uptrend, downtrend, ranging)\n"
@@ -939,61 +1330,82 @@ async def market_scan(
         "- Trading opportunity rating (Low/Medium/High)\n"
         "- Brief rationale\n\n"
         "Focus on actionable insights and clear opportunity identification."
-        "\n\n---\n"
-        "_Capital.com MCP — demo account recommended; this is not financial advice._"
+        + _FOOTER
     )
 
 
 @mcp.prompt()
-async def trade_proposal(
-    epic: str,
-    direction: str = "BUY",
-    thesis: str = "",
-    risk_percent: float = 1.0,
+def market_scan(
+    watchlist_id: str = "",
+    timeframe: str = "HOUR",
+    lookback_periods: int = 24,
 ) -> str:
     """
-    Trade proposal workflow - Design a trade with proper risk management.
+    Market scan workflow - Analyze markets in a watchlist.
 
-    This prompt guides you through creating a trade proposal with entry,
-    stop loss, and take profit levels. It uses preview to validate the trade
-    WITHOUT executing it.
+    This prompt guides you through scanning markets for trading opportunities.
+    It fetches a watchlist, retrieves price data for each market, and prompts
+    you to analyze the data for patterns and opportunities.
 
     Args:
-        epic: Market EPIC to trade (e.g., SILVER, GOLD, BTCUSD)
-        direction: Trade direction (BUY or SELL) - default: BUY
-        thesis: Your trading thesis/reasoning
-        risk_percent: Risk as % of account balance (default: 1.0%)
+        watchlist_id: ID of watchlist to scan (leave empty to list all watchlists first)
+        timeframe: Price resolution (MINUTE, MINUTE_5, MINUTE_15, MINUTE_30, HOUR, HOUR_4,
+            DAY, WEEK) - default: HOUR
+        lookback_periods: Number of candles to fetch (1-1000) - default: 24
 
     Workflow:
-    1. Call cap_market_get to fetch market details and dealing rules
-    2. Calculate position size based on risk_percent and stop loss distance
-    3. Call cap_trade_preview_position to validate the trade
-    4. Return the preview_id for potential execution (DO NOT execute yet)
+    1. If watchlist_id is empty, first call cap_watchlists_list to choose one
+    2. Call cap_watchlists_get to get markets in the watchlist
+    3. Call cap_market_prices_batch to get historical data for every market
+    4. Analyze the price data for trading opportunities
+    5. Optionally check cap_market_sentiment for client positioning
 
     Example usage:
-    - "Propose a trade for SILVER"
-    - "Create a trade proposal for buying GOLD with 2% risk"
+    - "Scan my watchlist for trading setups"
+    - "Analyze markets in watchlist abc123 over the last day"
     """
-    direction_upper = direction.upper()
-    if direction_upper not in ["BUY", "SELL"]:
+    timeframe_upper = timeframe.upper()
+    if timeframe_upper not in _TIMEFRAMES:
         return (
-            f"# Trade Proposal Error\n\n"
-            f"Invalid direction: '{direction}'. Must be 'BUY' or 'SELL'."
-            "\n\n---\n"
-            "_Capital.com MCP — demo account recommended; this is not financial advice._"
+            "# Market Scan Error\n\n"
+            f"Invalid timeframe: '{timeframe}'. "
+            f"Must be one of: {', '.join(r.value for r in PriceResolution)}."
+            + _FOOTER
         )
 
-    thesis_section = f"\n**Trading Thesis:**\n{thesis}\n" if thesis else ""
+    return _market_scan_text(watchlist_id, timeframe_upper, lookback_periods)
 
-    return (
-        "# Trade Proposal Workflow\n\n"
-        "\n> **Safety:** trades are **two-phase** — `preview` validates, then "
-        "`execute` with `confirm=true` places the order. Never skip the preview.\n"
-        f"**Market:** {epic}\n"
-        f"**Direction:** {direction_upper}\n"
-        f"**Risk:** {risk_percent}% of account balance\n"
-        f"{thesis_section}\n"
-        "---\n\n"
+
+_DIRECTIONS = frozenset(d.value for d in Direction)
+_DIRECTION_ERROR_TEMPLATE = (
+    "# Trade Proposal Error\n\n"
+    "Invalid direction: '{direction}'. Must be 'BUY' or 'SELL'."
+    + _FOOTER
+)
+
+
+# Header templates, with and without the optional thesis block.
+# The proposal header is assembled from parts, with the thesis block optional.
+_TRADE_PROPOSAL_INTRO = (
+    "# Trade Proposal Workflow\n\n"
+    "\n> **Safety:** trades are **two-phase** — `preview` validates, then "
+    "`execute` with `confirm=true` places the order. Never skip the preview.\n"
+    "**Market:** {epic}\n"
+    "**Direction:** {direction}\n"
+    "**Risk:** {risk_percent}% of account balance\n"
+)
+_TRADE_PROPOSAL_THESIS = "\n**Trading Thesis:**\n{thesis}\n"
+_TRADE_PROPOSAL_RULE = "\n---\n\n"
+_TRADE_PROPOSAL_HEAD = _TRADE_PROPOSAL_INTRO + _TRADE_PROPOSAL_RULE
+_TRADE_PROPOSAL_HEAD_WITH_THESIS = (
+    _TRADE_PROPOSAL_INTRO + _TRADE_PROPOSAL_THESIS + _TRADE_PROPOSAL_RULE
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _trade_proposal_text(epic: str, direction: str, thesis: str, risk_percent: float) -> str:
+    head = _TRADE_PROPOSAL_HEAD_WITH_THESIS if thesis else _TRADE_PROPOSAL_HEAD
+    return head.format(epic=epic, direction=direction, risk_percent=risk_percent, thesis=thesis) + (
         "**Step 1: Fetch Market Details**\n"
         f"Call `cap_market_get` with epic='{epic}' to get:\n"
         "- Current bid/offer prices\n"
@@ -1016,7 +1428,7 @@ async def trade_proposal(
         "**Step 4: Preview the Trade**\n"
         f"Call `cap_trade_preview_position` with:\n"
         f"- epic: '{epic}'\n"
-        f"- direction: '{direction_upper}'\n"
+        f"- direction: '{direction}'\n"
         "- size: calculated size\n"
         "- stop_level: your stop loss price\n"
         "- profit_level: your take profit price\n\n"
@@ -1036,7 +1448,7 @@ async def trade_proposal(
         "Present the trade proposal as:\n"
         "```\n"
         f"Market: {epic}\n"
-        f"Direction: {direction_upper}\n"
+        f"Direction: {direction}\n"
         "Entry: [estimated price]\n"
         "Stop Loss: [price] ([distance] points, [risk %]%)\n"
         "Take Profit: [price] ([distance] points, [reward:risk ratio])\n"
@@ -1047,58 +1459,68 @@ async def trade_proposal(
         "Preview ID: [uuid]\n"
         "Risk Checks: [✅/❌ status]\n"
         "```"
-        "\n\n---\n"
-        "_Capital.com MCP — demo account recommended; this is not financial advice._"
+        + _FOOTER
     )
 
 
 @mcp.prompt()
-async def execute_trade(preview_id: str = "") -> str:
+def trade_proposal(
+    epic: str,
+    direction: str = "BUY",
+    thesis: str = "",
+    risk_percent: float = 1.0,
+) -> str:
     """
-    Execute trade workflow - Execute a previewed trade safely.
+    Trade proposal workflow - Design a trade with proper risk management.
 
-    This prompt guides you through executing a trade that was previously
-    previewed. It includes confirmation polling and proper error handling.
+    This prompt guides you through creating a trade proposal with entry,
+    stop loss, and take profit levels. It uses preview to validate the trade
+    WITHOUT executing it.
 
     Args:
-        preview_id: Preview ID from trade_proposal workflow (required)
+        epic: Market EPIC to trade (e.g., SILVER, GOLD, BTCUSD)
+        direction: Trade direction (BUY or SELL) - default: BUY
+        thesis: Your trading thesis/reasoning
+        risk_percent: Risk as % of account balance (default: 1.0%)
 
     Workflow:
-    1. Verify preview_id is provided
-    2. Call cap_trade_execute_position with the preview_id and confirm=true
-    3. Poll for confirmation using cap_trade_confirm_wait or cap_trade_confirm_get
-    4. Report final status (ACCEPTED or REJECTED with reason)
-
-    Safety notes:
-    - Requires CAP_ALLOW_TRADING=true
-    - Requires epic in CAP_ALLOWED_EPICS allowlist
-    - Preview must not be expired (2-minute TTL)
-    - This WILL place a real trade with the broker
+    1. Call cap_market_get to fetch market details and dealing rules
+    2. Calculate position size based on risk_percent and stop loss distance
+    3. Call cap_trade_preview_position to validate the trade
+    4. Return the preview_id for potential execution (DO NOT execute yet)
 
     Example usage:
-    - "Execute the previewed trade"
-    - "Place the trade with preview ID abc-123-def"
+    - "Propose a trade for SILVER"
+    - "Create a trade proposal for buying GOLD with 2% risk"
     """
-    if not preview_id:
-        return (
-            "# Execute Trade Workflow - Missing Preview ID\n\n"
-            "⚠️ **Error:** preview_id is required.\n\n"
-            "**How to get a preview_id:**\n"
-            "1. Use the `trade_proposal` prompt to create a trade proposal\n"
-            "2. That workflow will call `cap_trade_preview_position`\n"
-            "3. The preview returns a preview_id (valid for 2 minutes)\n"
-            "4. Use that preview_id with this prompt to execute\n\n"
-            "**Example workflow:**\n"
-            "```\n"
-            "User: Propose a trade for SILVER\n"
-            "Assistant: [uses trade_proposal prompt, gets preview_id: 'abc-123']\n"
-            "User: Execute that trade\n"
-            "Assistant: [uses execute_trade prompt with preview_id='abc-123']\n"
-            "```"
-            "\n\n---\n"
-            "_Capital.com MCP — demo account recommended; this is not financial advice._"
-        )
+    direction_upper = direction.upper()
+    if direction_upper not in _DIRECTIONS:
+        return _DIRECTION_ERROR_TEMPLATE.format(direction=direction)
+
+    return _trade_proposal_text(epic, direction_upper, thesis, risk_percent)
+
+
+_EXECUTE_TRADE_MISSING_ID_TEXT = (
+    "# Execute Trade Workflow - Missing Preview ID\n\n"
+    "⚠️ **Error:** preview_id is required.\n\n"
+    "**How to get a preview_id:**\n"
+    "1. Use the `trade_proposal` prompt to create a trade proposal\n"
+    "2. That workflow will call `cap_trade_preview_position`\n"
+    "3. The preview returns a preview_id (valid for 2 minutes)\n"
+    "4. Use that preview_id with this prompt to execute\n\n"
+    "**Example workflow:**\n"
+    "```\n"
+    "User: Propose a trade for SILVER\n"
+    "Assistant: [uses trade_proposal prompt, gets preview_id: 'abc-123']\n"
+    "User: Execute that trade\n"
+    "Assistant: [uses execute_trade prompt with preview_id='abc-123']\n"
+    "```"
+    + _FOOTER
+)
 
+
+@functools.lru_cache(maxsize=256)
+def _execute_trade_text(preview_id: str) -> str:
     return (
         "# Execute Trade Workflow\n\n"
         "\n> **Safety:** trades are **two-phase** — `preview` validates, then "
@@ -1115,13 +1537,15 @@ async def execute_trade(preview_id: str = "") -> str:
         f"Call `cap_trade_execute_position` with:\n"
         f"- preview_id: '{preview_id}'\n"
         "- confirm: true\n"
-        "- wait_for_confirm: true (recommended)\n\n"
+        "- wait_for_confirm: true\n\n"
         "This will:\n"
         "1. Validate the preview_id is still valid\n"
         "2. Re-check all risk controls\n"
         "3. Submit the order to Capital.com broker\n"
-        "4. Return a deal_reference\n"
-        "5. Automatically poll for confirmation (if wait_for_confirm=true)\n\n"
+        "4. Return the deal_reference together with the broker's confirmation\n\n"
+        "Do not poll `cap_trade_confirm_get` in a loop: with wait_for_confirm=true the "
+        "confirmation is already in the execute response. Only if it reports TIMEOUT, "
+        "make one `cap_trade_confirm_wait` call with the deal_reference.\n\n"
         "**Step 2: Confirmation Status**\n"
         "The broker will respond with:\n"
         "- **ACCEPTED:** Trade executed successfully\n"
@@ -1133,8 +1557,10 @@ async def execute_trade(preview_id: str = "") -> str:
         "  - reason: Why it was rejected (e.g., insufficient margin, market closed)\n\n"
         "**Step 3: Post-Execution Actions**\n"
         "If ACCEPTED:\n"
-        "- Call `cap_trade_positions_get` with the deal_id to see position details\n"
-        "- Verify stop loss and take profit were set correctly\n"
+        "- The execute response already has everything to report: the confirmation "
+        "(deal_id, level, size, direction) plus `requested` (epic, stop_level, "
+        "profit_level, ... from the preview). No further call is needed; use "
+        "`cap_trade_positions_get` only if you want a fresh view of the position\n"
         "- Record the trade in your trading journal\n\n"
         "If REJECTED:\n"
         "- Review the rejection reason\n"
@@ -1167,13 +1593,147 @@ async def execute_trade(preview_id: str = "") -> str:
         "Reason: [broker rejection reason]\n"
         "Status: REJECTED\n"
         "```"
-        "\n\n---\n"
-        "_Capital.com MCP — demo account recommended; this is not financial advice._"
+        + _FOOTER
     )
 
 
 @mcp.prompt()
-async def position_review() -> str:
+def execute_trade(preview_id: str = "") -> str:
+    """
+    Execute trade workflow - Execute a previewed trade safely.
+
+    This prompt guides you through executing a trade that was previously
+    previewed. The execute call waits for the broker's confirmation itself.
+
+    Args:
+        preview_id: Preview ID from trade_proposal workflow (required)
+
+    Workflow:
+    1. Verify preview_id is provided
+    2. Call cap_trade_execute_position with the preview_id and confirm=true
+    3. Read the confirmation from the execute response (cap_trade_confirm_wait only on TIMEOUT)
+    4. Report final status (ACCEPTED or REJECTED with reason)
+
+    Safety notes:
+    - Requires CAP_ALLOW_TRADING=true
+    - Requires epic in CAP_ALLOWED_EPICS allowlist
+    - Preview must not be expired (2-minute TTL)
+    - This WILL place a real trade with the broker
+
+    Example usage:
+    - "Execute the previewed trade"
+    - "Place the trade with preview ID abc-123-def"
+    """
+    if not preview_id:
+        return _EXECUTE_TRADE_MISSING_ID_TEXT
+    return _execute_trade_text(preview_id)
+
+
+# position_review takes no arguments, so its text is built once at import.
+_POSITION_REVIEW_TEXT = (
+    "# Position Review Workflow\n\n"
+    "\n> **Safety:** this is read-only. Any follow-up trade must go through "
+    "the two-phase `preview` → `execute` flow.\n"
+    "Let's analyze your current trading positions and orders.\n\n"
+    "Steps 1 and 2 are independent: call `cap_trade_positions_list` and "
+    "`cap_trade_orders_list` in parallel (same turn), not one after the other.\n\n"
+    "**Step 1: Fetch Open Positions**\n"
+    "Call `cap_trade_positions_list` to get all open positions. That one response "
+    "already has the live quote and unrealized P&L for every position, so do not "
+    "fetch prices per position. For each entry read:\n"
+    "- `position`: dealId, direction, size, level (entry), upl (unrealized P&L), "
+    "stopLevel, profitLevel\n"
+    "- `market`: epic, bid and offer (current price)\n\n"
+    "**Step 2: Fetch Working Orders**\n"
+    "Call `cap_trade_orders_list` to get all pending orders.\n\n"
+    "For each order, extract:\n"
+    "- order_id & market (EPIC)\n"
+    "- Direction (BUY/SELL)\n"
+    "- Size & trigger level\n"
+    "- Order type (LIMIT/STOP)\n"
+    "- Good till date\n\n"
+    "**Step 3: Calculate Key Metrics**\n\n"
+    "*Per Position:*\n"
+    "- P&L (currency and %)\n"
+    "- Risk (distance to stop loss in currency)\n"
+    "- Reward (distance to take profit in currency)\n"
+    "- Days held\n"
+    "- Status (winning/losing, at risk/safe)\n\n"
+    "*Portfolio Level:*\n"
+    "- Total unrealized P&L\n"
+    "- Total capital at risk (sum of all stop loss distances)\n"
+    "- Largest winning position\n"
+    "- Largest losing position\n"
+    "- Net directional exposure (net long/short across all positions)\n\n"
+    "**Step 4: Risk Analysis**\n\n"
+    "*Check for:*\n"
+    "- **Concentration Risk:** Too much exposure to one market\n"
+    "- **Correlation Risk:** Multiple positions in correlated markets\n"
+    "  - (e.g., GOLD and SILVER often move together)\n"
+    "- **Directional Bias:** Are you heavily long or short overall?\n"
+    "- **Stop Loss Coverage:** Are all positions protected?\n"
+    "- **Profit Target Coverage:** Do all positions have take profits?\n\n"
+    "**Step 5: Position Health Check**\n\n"
+    "For each position, assess:\n"
+    "- ✅ **Healthy:** In profit, stop loss at breakeven or better\n"
+    "- ⚠️ **At Risk:** Near stop loss, or stop too wide\n"
+    "- 🔍 **Needs Attention:** No stop loss, or profit target hit\n"
+    "- ❌ **Losing:** Underwater, stop loss not adjusted\n\n"
+    "**Step 6: Adjustment Suggestions**\n\n"
+    "*Potential actions (DO NOT execute):*\n"
+    "- Move stop loss to breakeven on winning positions\n"
+    "- Tighten stop loss if trade is going your way\n"
+    "- Close losing positions if thesis invalidated\n"
+    "- Take partial profits on large winners\n"
+    "- Cancel stale working orders\n"
+    "- Reduce exposure in correlated markets\n\n"
+    "**Step 7: Market Context (Optional)**\n\n"
+    "For key positions, fetch everything in one parallel round:\n"
+    "- One `cap_market_prices_batch` call with all their EPICs for recent price action\n"
+    "- `cap_market_sentiment` for each of them, issued in parallel with the batch call\n"
+    "- Consider if stop loss is at a logical level\n\n"
+    "**Output Format:**\n\n"
+    "```\n"
+    "# Portfolio Summary\n"
+    "Total Open Positions: [count]\n"
+    "Total Working Orders: [count]\n"
+    "Total Unrealized P&L: [amount] ([%])\n"
+    "Capital at Risk: [amount]\n"
+    "Net Exposure: [net long/short description]\n\n"
+    "# Position Details\n\n"
+    "## Position 1: [EPIC] [BUY/SELL] [size]\n"
+    "Entry: [price] | Current: [price] | P&L: [amount] ([%])\n"
+    "Stop: [price] (Risk: [amount]) | Target: [price] (Reward: [amount])\n"
+    "Status: [✅/⚠️/🔍/❌] [description]\n"
+    "Suggestion: [specific action recommendation]\n\n"
+    "[... repeat for each position ...]\n\n"
+    "# Working Orders\n\n"
+    "## Order 1: [EPIC] [type] [direction] @ [trigger_price]\n"
+    "Size: [size] | Expires: [date]\n"
+    "Status: [active/stale]\n"
+    "Suggestion: [keep/cancel/adjust]\n\n"
+    "[... repeat for each order ...]\n\n"
+    "# Risk Assessment\n"
+    "Concentration: [assessment]\n"
+    "Correlation: [assessment]\n"
+    "Directional Bias: [assessment]\n"
+    "Stop Loss Coverage: [% of positions protected]\n\n"
+    "# Recommended Actions\n"
+    "1. [Priority action 1]\n"
+    "2. [Priority action 2]\n"
+    "3. [Priority action 3]\n"
+    "```\n\n"
+    "**Important Notes:**\n"
+    "- This workflow is READ-ONLY and analytical\n"
+    "- No trades will be executed automatically\n"
+    "- All suggestions require user approval before execution\n"
+    "- Use appropriate tools (cap_trade_positions_close, etc.) to act on suggestions"
+    + _FOOTER
+)
+
+
+@mcp.prompt()
+def position_review() -> str:
     """
     Position review workflow - Analyze current positions and orders.
 
@@ -1195,111 +1755,81 @@ async def position_review() -> str:
     - "Analyze my portfolio exposure"
     - "Show me my open trades and their status"
     """
-    return (
-        "# Position Review Workflow\n\n"
-        "\n> **Safety:** this is read-only. Any follow-up trade must go through "
-        "the two-phase `preview` → `execute` flow.\n"
-        "Let's analyze your current trading positions and orders.\n\n"
-        "**Step 1: Fetch Open Positions**\n"
-        "Call `cap_trade_positions_list` to get all open positions.\n\n"
-        "For each position, extract:\n"
-        "- deal_id & market (EPIC)\n"
-        "- Direction (BUY/SELL)\n"
-        "- Size & entry level (price)\n"
-        "- Current market price\n"
-        "- Unrealized P&L\n"
-        "- Stop loss & take profit levels\n\n"
-        "**Step 2: Fetch Working Orders**\n"
-        "Call `cap_trade_orders_list` to get all pending orders.\n\n"
-        "For each order, extract:\n"
-        "- order_id & market (EPIC)\n"
-        "- Direction (BUY/SELL)\n"
-        "- Size & trigger level\n"
-        "- Order type (LIMIT/STOP)\n"
-        "- Good till date\n\n"
-        "**Step 3: Calculate Key Metrics**\n\n"
-        "*Per Position:*\n"
-        "- P&L (currency and %)\n"
-        "- Risk (distance to stop loss in currency)\n"
-        "- Reward (distance to take profit in currency)\n"
-        "- Days held\n"
-        "- Status (winning/losing, at risk/safe)\n\n"
-        "*Portfolio Level:*\n"
-        "- Total unrealized P&L\n"
-        "- Total capital at risk (sum of all stop loss distances)\n"
-        "- Largest winning position\n"
-        "- Largest losing position\n"
-        "- Net directional exposure (net long/short across all positions)\n\n"
-        "**Step 4: Risk Analysis**\n\n"
-        "*Check for:*\n"
-        "- **Concentration Risk:** Too much exposure to one market\n"
-        "- **Correlation Risk:** Multiple positions in correlated markets\n"
-        "  - (e.g., GOLD and SILVER often move together)\n"
-        "- **Directional Bias:** Are you heavily long or short overall?\n"
-        "- **Stop Loss Coverage:** Are all positions protected?\n"
-        "- **Profit Target Coverage:** Do all positions have take profits?\n\n"
-        "**Step 5: Position Health Check**\n\n"
-        "For each position, assess:\n"
-        "- ✅ **Healthy:** In profit, stop loss at breakeven or better\n"
-        "- ⚠️ **At Risk:** Near stop loss, or stop too wide\n"
-        "- 🔍 **Needs Attention:** No stop loss, or profit target hit\n"
-        "- ❌ **Losing:** Underwater, stop loss not adjusted\n\n"
-        "**Step 6: Adjustment Suggestions**\n\n"
-        "*Potential actions (DO NOT execute):*\n"
-        "- Move stop loss to breakeven on winning positions\n"
-        "- Tighten stop loss if trade is going your way\n"
-        "- Close losing positions if thesis invalidated\n"
-        "- Take partial profits on large winners\n"
-        "- Cancel stale working orders\n"
-        "- Reduce exposure in correlated markets\n\n"
-        "**Step 7: Market Context (Optional)**\n\n"
-        "For key positions:\n"
-        "- Call `cap_market_sentiment` to see client positioning\n"
-        "- Call `cap_market_prices` to check recent price action\n"
-        "- Consider if stop loss is at a logical level\n\n"
-        "**Output Format:**\n\n"
-        "```\n"
-        "# Portfolio Summary\n"
-        "Total Open Positions: [count]\n"
-        "Total Working Orders: [count]\n"
-        "Total Unrealized P&L: [amount] ([%])\n"
-        "Capital at Risk: [amount]\n"
-        "Net Exposure: [net long/short description]\n\n"
-        "# Position Details\n\n"
-        "## Position 1: [EPIC] [BUY/SELL] [size]\n"
-        "Entry: [price] | Current: [price] | P&L: [amount] ([%])\n"
-        "Stop: [price] (Risk: [amount]) | Target: [price] (Reward: [amount])\n"
-        "Status: [✅/⚠️/🔍/❌] [description]\n"
-        "Suggestion: [specific action recommendation]\n\n"
-        "[... repeat for each position ...]\n\n"
-        "# Working Orders\n\n"
-        "## Order 1: [EPIC] [type] [direction] @ [trigger_price]\n"
-        "Size: [size] | Expires: [date]\n"
-        "Status: [active/stale]\n"
-        "Suggestion: [keep/cancel/adjust]\n\n"
-        "[... repeat for each order ...]\n\n"
-        "# Risk Assessment\n"
-        "Concentration: [assessment]\n"
-        "Correlation: [assessment]\n"
-        "Directional Bias: [assessment]\n"
-        "Stop Loss Coverage: [% of positions protected]\n\n"
-        "# Recommended Actions\n"
-        "1. [Priority action 1]\n"
-        "2. [Priority action 2]\n"
-        "3. [Priority action 3]\n"
-        "```\n\n"
-        "**Important Notes:**\n"
-        "- This workflow is READ-ONLY and analytical\n"
-        "- No trades will be executed automatically\n"
-        "- All suggestions require user approval before execution\n"
-        "- Use appropriate tools (cap_trade_positions_close, etc.) to act on suggestions"
-        "\n\n---\n"
-        "_Capital.com MCP — demo account recommended; this is not financial advice._"
-    )
+    return _POSITION_REVIEW_TEXT
+
+
+# Only a handful of arguments vary, so both texts are pre-built templates.
+_LIVE_PRICE_SETUP_TEMPLATE = (
+    "# 📊 Live Price Monitor Workflow\n\n"
+    "**Real-time price tracking with WebSocket streaming**\n\n"
+    "---\n\n"
+    "**Step 1: Select Markets**\n"
+    "First, choose which markets you want to monitor:\n"
+    "- Call `cap_market_search` to find markets by name/category\n"
+    "- Or call `cap_watchlists_list` to see your watchlists\n"
+    "- Or call `cap_watchlists_get` to get markets from a specific watchlist\n"
+    "- Maximum: 40 markets simultaneously\n\n"
+    "**Parameters for next steps:**\n"
+    "- Duration: {duration_minutes} minutes\n"
+    "- Alert threshold: {threshold_percent}% price movement\n\n"
+    "After you have your EPICs list, use this prompt again with the epics parameter.\n"
+    'Example: `live_price_monitor(epics=["GOLD", "SILVER"], duration_minutes=2.0)`'
+    + _FOOTER
+)
+
+_LIVE_PRICE_MONITOR_TEMPLATE = (
+    "# 📊 Live Price Monitor\n\n"
+    "**Monitoring:** {monitoring}\n"
+    "**Duration:** {duration_minutes} minutes | "
+    "**Alert threshold:** {threshold_percent}%\n\n"
+    "---\n\n"
+    "**Step 2: Fetch Initial Prices**\n"
+    "Get baseline prices for comparison:\n"
+    "- For each EPIC, call `cap_market_prices` with resolution=MINUTE and max=1\n"
+    "- Record current bid/offer/mid prices\n"
+    "- This establishes the starting point for threshold alerts\n\n"
+    "**Step 3: [STREAM] Start Real-Time Monitoring**\n"
+    "Call `cap_stream_prices` to start WebSocket streaming:\n"
+    "- epics: {epics}\n"
+    "- duration_s: {duration_s}\n"
+    "- update_interval_s: 1.0 (updates every second)\n\n"
+    "⚡ **While streaming:**\n"
+    "- Display live price board (update continuously as ticks arrive)\n"
+    "- Calculate % change from baseline for each market\n"
+    "- **Alert** when any market moves > {threshold_percent}%\n"
+    "- Show timestamp for each update\n\n"
+    "**Step 4: Present Live Dashboard**\n"
+    "Format the output as a continuously updating table:\n"
+    "```\n"
+    "📊 LIVE PRICES (auto-updating)\n"
+    "───────────────────────────────────────\n"
+    "EPIC     | Bid      | Offer    | Change\n"
+    "───────────────────────────────────────\n"
+    "GOLD     | 2,048.50 | 2,049.00 | +0.5% ⚡\n"
+    "SILVER   | 27.80    | 27.82    | -0.2%\n"
+    "───────────────────────────────────────\n"
+    "Last update: HH:MM:SS\n"
+    "```\n\n"
+    "⚠️ **Alert format** (when change > {threshold_percent}%):\n"
+    "```\n"
+    "⚡ PRICE ALERT: GOLD\n"
+    "   Moved {threshold_percent}%+ from baseline\n"
+    "   Current: $2,048.50 (was $2,038.00)\n"
+    "   Change: +$10.50 (+0.52%)\n"
+    "   Time: 14:32:18\n"
+    "```\n\n"
+    "**Important Notes:**\n"
+    "- ✅ WebSocket provides sub-second updates\n"
+    "- ⏱️ Stream auto-stops after {duration_minutes} minutes\n"
+    "- 🔄 Auto-reconnects if connection drops (up to 3 attempts)\n"
+    "- 🚫 Requires CAP_WS_ENABLED=true in config\n"
+    "- 📊 Capital.com sends updates when prices change (not on fixed interval)\n"
+    + _FOOTER
+)
 
 
 @mcp.prompt()
-async def live_price_monitor(
+def live_price_monitor(
     epics: list[str] | None = None,
     duration_minutes: float = 5.0,
     threshold_percent: float = 1.0,
@@ -1331,84 +1861,26 @@ async def live_price_monitor(
     - "Watch BTC for next 5 minutes, alert on 2% moves"
     - "Track my watchlist in real-time"
     """
-    if epics is None:
-        epics = []
     if not epics:
-        return (
-            "# 📊 Live Price Monitor Workflow\n\n"
-            "**Real-time price tracking with WebSocket streaming**\n\n"
-            "---\n\n"
-            "**Step 1: Select Markets**\n"
-            "First, choose which markets you want to monitor:\n"
-            "- Call `cap_market_search` to find markets by name/category\n"
-            "- Or call `cap_watchlists_list` to see your watchlists\n"
-            "- Or call `cap_watchlists_get` to get markets from a specific watchlist\n"
-            "- Maximum: 40 markets simultaneously\n\n"
-            "**Parameters for next steps:**\n"
-            f"- Duration: {duration_minutes} minutes\n"
-            f"- Alert threshold: {threshold_percent}% price movement\n\n"
-            "After you have your EPICs list, use this prompt again with the epics parameter.\n"
-            'Example: `live_price_monitor(epics=["GOLD", "SILVER"], duration_minutes=2.0)`'
-            "\n\n---\n"
-            "_Capital.com MCP — demo account recommended; this is not financial advice._"
+        return _LIVE_PRICE_SETUP_TEMPLATE.format(
+            duration_minutes=duration_minutes, threshold_percent=threshold_percent
         )
 
-    return (
-        "# 📊 Live Price Monitor\n\n"
-        f"**Monitoring:** {', '.join(epics[:5])}"
-        + (f" (+{len(epics) - 5} more)" if len(epics) > 5 else "")
-        + "\n"
-        f"**Duration:** {duration_minutes} minutes | "
-        f"**Alert threshold:** {threshold_percent}%\n\n"
-        "---\n\n"
-        "**Step 2: Fetch Initial Prices**\n"
-        "Get baseline prices for comparison:\n"
-        "- For each EPIC, call `cap_market_prices` with resolution=MINUTE and max=1\n"
-        "- Record current bid/offer/mid prices\n"
-        "- This establishes the starting point for threshold alerts\n\n"
-        "**Step 3: [STREAM] Start Real-Time Monitoring**\n"
-        f"Call `cap_stream_prices` to start WebSocket streaming:\n"
-        f"- epics: {epics}\n"
-        f"- duration_s: {duration_minutes * 60}\n"
-        "- update_interval_s: 1.0 (updates every second)\n\n"
-        "⚡ **While streaming:**\n"
-        "- Display live price board (update continuously as ticks arrive)\n"
-        "- Calculate % change from baseline for each market\n"
-        f"- **Alert** when any market moves > {threshold_percent}%\n"
-        "- Show timestamp for each update\n\n"
-        "**Step 4: Present Live Dashboard**\n"
-        "Format the output as a continuously updating table:\n"
-        "```\n"
-        "📊 LIVE PRICES (auto-updating)\n"
-        "───────────────────────────────────────\n"
-        "EPIC     | Bid      | Offer    | Change\n"
-        "───────────────────────────────────────\n"
-        "GOLD     | 2,048.50 | 2,049.00 | +0.5% ⚡\n"
-        "SILVER   | 27.80    | 27.82    | -0.2%\n"
-        "───────────────────────────────────────\n"
-        "Last update: HH:MM:SS\n"
-        "```\n\n"
-        f"⚠️ **Alert format** (when change > {threshold_percent}%):\n"
-        "```\n"
-        "⚡ PRICE ALERT: GOLD\n"
-        f"   Moved {threshold_percent}%+ from baseline\n"
-        "   Current: $2,048.50 (was $2,038.00)\n"
-        "   Change: +$10.50 (+0.52%)\n"
-        "   Time: 14:32:18\n"
-        "```\n\n"
-        "**Important Notes:**\n"
-        "- ✅ WebSocket provides sub-second updates\n"
-        f"- ⏱️ Stream auto-stops after {duration_minutes} minutes\n"
-        "- 🔄 Auto-reconnects if connection drops (up to 3 attempts)\n"
-        "- 🚫 Requires CAP_WS_ENABLED=true in config\n"
-        "- 📊 Capital.com sends updates when prices change (not on fixed interval)\n"
-        "\n\n---\n"
-        "_Capital.com MCP — demo account recommended; this is not financial advice._"
+    if len(epics) <= 5:
+        monitoring = ", ".join(epics)
+    else:
+        monitoring = f"{', '.join(epics[:5])} (+{len(epics) - 5} more)"
+    return _LIVE_PRICE_MONITOR_TEMPLATE.format(
+        monitoring=monitoring,
+        epics=epics,
+        duration_minutes=duration_minutes,
+        duration_s=duration_minutes * 60,
+        threshold_percent=threshold_percent,
     )
 
 
 @mcp.prompt()
-async def real_time_alerts(
+def real_time_alerts(
     alert_config: dict[str, float] | None = None,
     duration_minutes: float = 5.0,
     auto_stop: bool = True,
@@ -1438,8 +1910,6 @@ async def real_time_alerts(
     - "Notify when SILVER drops below 28"
     - "Watch breakout levels for BTC and ETH"
     """
-    if alert_config is None:
-        alert_config = {}
     if not alert_config:
         return (
             "# ⚡ Real-Time Alerts Setup\n\n"
@@ -1470,22 +1940,22 @@ async def real_time_alerts(
             "```\n\n"
             "Then call this prompt again with alert_config parameter.\n"
             'Example: `real_time_alerts(alert_config={"GOLD": 2050.0}, duration_minutes=5.0)`'
-            "\n\n---\n"
-            "_Capital.com MCP — demo account recommended; this is not financial advice._"
+            + _FOOTER
         )
 
-    return (
+    parts = [
         "# ⚡ Real-Time Alert Monitoring\n\n"
         f"**Configured alerts:** {len(alert_config)} markets\n"
         f"**Duration:** {duration_minutes} minutes | "
         f"**Auto-stop after alert:** {'Yes' if auto_stop else 'No'}\n\n"
         "---\n\n"
-        "**Alert Configuration:**\n"
-        + "\n".join(
-            [f"- {epic}: {level:,.2f}" for epic, level in list(alert_config.items())[:10]]
-        )
-        + ("\n- ..." if len(alert_config) > 10 else "")
-        + "\n\n"
+        "**Alert Configuration:**\n",
+        "\n".join(f"- {epic}: {level:,.2f}" for epic, level in islice(alert_config.items(), 10)),
+    ]
+    if len(alert_config) > 10:
+        parts.append("\n- ...")
+    parts.append(
+        "\n\n"
         "**Step 2: Fetch Current Prices**\n"
         "Get current market prices to determine direction:\n"
         "- For each EPIC in alert_config, call `cap_market_get`\n"
@@ -1495,13 +1965,15 @@ async def real_time_alerts(
         "Call `cap_stream_alerts` with formatted configuration:\n"
         "```python\n"
         "alerts = {\n"
-        + "\n".join(
-            [
-                f'  "{epic}": {{"level": {level}, "direction": "ABOVE"}}  # Adjust direction based on current price'
-                for epic, level in list(alert_config.items())[:3]
-            ]
+    )
+    parts.append(
+        "\n".join(
+            f'  "{epic}": {{"level": {level}, "direction": "ABOVE"}}  # Adjust direction based on current price'
+            for epic, level in islice(alert_config.items(), 3)
         )
-        + "\n}\n"
+    )
+    parts.append(
+        "\n}\n"
         "```\n\n"
         f"- duration_s: {duration_minutes * 60}\n"
         f"- auto_close: {auto_stop}\n\n"
@@ -1509,12 +1981,14 @@ async def real_time_alerts(
         "- WebSocket streams live price updates\n"
         "- Each tick is checked against alert conditions\n"
         "- Instant notification when level crossed\n"
-        + (
-            "- Monitoring stops after first alert\n"
-            if auto_stop
-            else "- Continues monitoring all markets\n"
-        )
-        + "\n"
+    )
+    parts.append(
+        "- Monitoring stops after first alert\n"
+        if auto_stop
+        else "- Continues monitoring all markets\n"
+    )
+    parts.append(
+        "\n"
         "**Step 4: Handle Alert Triggers**\n"
         "When an alert fires, display:\n"
         "```\n"
@@ -1539,13 +2013,83 @@ async def real_time_alerts(
         "- 📊 Checks mid-price: (bid + offer) / 2\n"
         "- 🚫 Requires CAP_WS_ENABLED=true\n"
         f"- ⏱️ Max duration: {duration_minutes} minutes (Capital.com limit: 10 min)\n"
-        "\n\n---\n"
-        "_Capital.com MCP — demo account recommended; this is not financial advice._"
+        + _FOOTER
     )
+    return "".join(parts)
+
+
+# Only the two arguments vary, so the text is one pre-built template.
+_LIVE_PORTFOLIO_MONITOR_TEMPLATE = (
+    "# 💼 Live Portfolio Monitor\n\n"
+    "**Duration:** {duration_minutes} minutes | "
+    "**P&L alert threshold:** ${alert_pnl_threshold:,.2f}\n\n"
+    "---\n\n"
+    "**Step 1: Fetch Open Positions**\n"
+    "Get your current portfolio:\n"
+    "- Call `cap_trade_positions_list` to get all open positions\n"
+    "- Extract: deal IDs, EPICs, directions, sizes, current P&L\n"
+    "- If no positions: Cannot monitor empty portfolio\n\n"
+    "**Step 2: Extract Position EPICs**\n"
+    "Identify which markets to monitor:\n"
+    "- Get unique EPICs from all positions\n"
+    "- Note: Max 40 markets (Capital.com WebSocket limit)\n"
+    "- If > 40 positions, prioritize largest positions\n\n"
+    "**Step 3: [STREAM] Monitor Portfolio in Real-Time**\n"
+    "Call `cap_stream_portfolio`:\n"
+    "- duration_s: {duration_s}\n"
+    "- update_interval_s: 5.0 (updates every 5 seconds)\n\n"
+    "📊 **While streaming:**\n"
+    "- WebSocket streams price updates for all position markets\n"
+    "- Recalculates P&L every 5 seconds\n"
+    "- Displays live portfolio dashboard\n"
+    "- **Alerts** when total P&L crosses ${alert_pnl_threshold:,.2f}\n\n"
+    "**Step 4: Display Live Dashboard**\n"
+    "Format as continuously updating portfolio summary:\n"
+    "```\n"
+    "💼 LIVE PORTFOLIO DASHBOARD\n"
+    "═══════════════════════════════════════════════════════\n"
+    "Position     | Direction | Size  | P&L       | Status\n"
+    "───────────────────────────────────────────────────────\n"
+    "GOLD         | BUY       | 0.5   | +$125.50  | ✅\n"
+    "SILVER       | SELL      | 2.0   | -$18.20   | 📊\n"
+    "BTCUSD       | BUY       | 0.1   | +$230.00  | ⚡\n"
+    "───────────────────────────────────────────────────────\n"
+    "TOTAL P&L:                         +$337.30  | 🎯\n"
+    "═══════════════════════════════════════════════════════\n"
+    "Last update: 14:32:18 | Updates every 5s\n"
+    "```\n\n"
+    "**Status Indicators:**\n"
+    "- ✅ Winning (P&L > 0)\n"
+    "- 📊 Flat (P&L ≈ 0)\n"
+    "- ⚠️ Losing but within risk tolerance\n"
+    "- 🔴 Significant loss\n\n"
+    "**Alert Format** (when total P&L crosses ${alert_pnl_threshold:,.2f}):\n"
+    "```\n"
+    "🎯 P&L THRESHOLD ALERT!\n"
+    "   Total P&L crossed ${alert_pnl_threshold:,.2f}\n"
+    "   Current P&L: +$337.30\n"
+    "   Time: 14:32:18\n"
+    "   Action: Review positions, consider taking profits\n"
+    "```\n\n"
+    "**Optional Follow-Up Actions:**\n"
+    "Based on live P&L:\n"
+    "1. 💰 **Taking Profits:** Use `cap_trade_positions_close` to close winning positions\n"
+    "2. 🛑 **Cutting Losses:** Close losing positions before they worsen\n"
+    "3. 📊 **Position Details:** Call `cap_trade_positions_get` for specific position\n"
+    "4. 🎯 **Adjust Stops:** Update stop losses on running positions\n\n"
+    "**Important Notes:**\n"
+    "- ⚡ P&L updates as prices change (real-time)\n"
+    "- 🔄 Updates every 5 seconds (configurable)\n"
+    "- 📊 Includes all open positions automatically\n"
+    "- 🚫 Requires CAP_WS_ENABLED=true and active positions\n"
+    "- ⏱️ Auto-stops after {duration_minutes} minutes\n"
+    "- 💡 Simplified P&L calculation (demo purposes - real calc needs more data)\n"
+    + _FOOTER
+)
 
 
 @mcp.prompt()
-async def live_portfolio_monitor(
+def live_portfolio_monitor(
     duration_minutes: float = 5.0,
     alert_pnl_threshold: float = 100.0,
 ) -> str:
@@ -1573,73 +2117,10 @@ async def live_portfolio_monitor(
     - "Watch positions in real-time, alert at $500 P&L"
     - "Track live portfolio performance"
     """
-    return (
-        "# 💼 Live Portfolio Monitor\n\n"
-        f"**Duration:** {duration_minutes} minutes | "
-        f"**P&L alert threshold:** ${alert_pnl_threshold:,.2f}\n\n"
-        "---\n\n"
-        "**Step 1: Fetch Open Positions**\n"
-        "Get your current portfolio:\n"
-        "- Call `cap_trade_positions_list` to get all open positions\n"
-        "- Extract: deal IDs, EPICs, directions, sizes, current P&L\n"
-        "- If no positions: Cannot monitor empty portfolio\n\n"
-        "**Step 2: Extract Position EPICs**\n"
-        "Identify which markets to monitor:\n"
-        "- Get unique EPICs from all positions\n"
-        "- Note: Max 40 markets (Capital.com WebSocket limit)\n"
-        "- If > 40 positions, prioritize largest positions\n\n"
-        "**Step 3: [STREAM] Monitor Portfolio in Real-Time**\n"
-        f"Call `cap_stream_portfolio`:\n"
-        f"- duration_s: {duration_minutes * 60}\n"
-        "- update_interval_s: 5.0 (updates every 5 seconds)\n\n"
-        "📊 **While streaming:**\n"
-        "- WebSocket streams price updates for all position markets\n"
-        "- Recalculates P&L every 5 seconds\n"
-        "- Displays live portfolio dashboard\n"
-        f"- **Alerts** when total P&L crosses ${alert_pnl_threshold:,.2f}\n\n"
-        "**Step 4: Display Live Dashboard**\n"
-        "Format as continuously updating portfolio summary:\n"
-        "```\n"
-        "💼 LIVE PORTFOLIO DASHBOARD\n"
-        "═══════════════════════════════════════════════════════\n"
-        "Position     | Direction | Size  | P&L       | Status\n"
-        "───────────────────────────────────────────────────────\n"
-        "GOLD         | BUY       | 0.5   | +$125.50  | ✅\n"
-        "SILVER       | SELL      | 2.0   | -$18.20   | 📊\n"
-        "BTCUSD       | BUY       | 0.1   | +$230.00  | ⚡\n"
-        "───────────────────────────────────────────────────────\n"
-        "TOTAL P&L:                         +$337.30  | 🎯\n"
-        "═══════════════════════════════════════════════════════\n"
-        "Last update: 14:32:18 | Updates every 5s\n"
-        "```\n\n"
-        "**Status Indicators:**\n"
-        "- ✅ Winning (P&L > 0)\n"
-        "- 📊 Flat (P&L ≈ 0)\n"
-        "- ⚠️ Losing but within risk tolerance\n"
-        "- 🔴 Significant loss\n\n"
-        f"**Alert Format** (when total P&L crosses ${alert_pnl_threshold:,.2f}):\n"
-        "```\n"
-        "🎯 P&L THRESHOLD ALERT!\n"
-        f"   Total P&L crossed ${alert_pnl_threshold:,.2f}\n"
-        "   Current P&L: +$337.30\n"
-        "   Time: 14:32:18\n"
-        "   Action: Review positions, consider taking profits\n"
-        "```\n\n"
-        "**Optional Follow-Up Actions:**\n"
-        "Based on live P&L:\n"
-        "1. 💰 **Taking Profits:** Use `cap_trade_positions_close` to close winning positions\n"
-        "2. 🛑 **Cutting Losses:** Close losing positions before they worsen\n"
-        "3. 📊 **Position Details:** Call `cap_trade_positions_get` for specific position\n"
-        "4. 🎯 **Adjust Stops:** Update stop losses on running positions\n\n"
-        "**Important Notes:**\n"
-        "- ⚡ P&L updates as prices change (real-time)\n"
-        "- 🔄 Updates every 5 seconds (configurable)\n"
-        "- 📊 Includes all open positions automatically\n"
-        "- 🚫 Requires CAP_WS_ENABLED=true and active positions\n"
-        f"- ⏱️ Auto-stops after {duration_minutes} minutes\n"
-        "- 💡 Simplified P&L calculation (demo purposes - real calc needs more data)\n"
-        "\n\n---\n"
-        "_Capital.com MCP — demo account recommended; this is not financial advice._"
+    return _LIVE_PORTFOLIO_MONITOR_TEMPLATE.format(
+        duration_minutes=duration_minutes,
+        duration_s=duration_minutes * 60,
+        alert_pnl_threshold=alert_pnl_threshold,
     )
 
 
@@ -1652,7 +2133,6 @@ async def live_portfolio_monitor(
 async def search(query: str) -> dict[str, Any]:
     """ChatGPT Deep Research: search Capital.com markets. Returns {results:[{id,title,url}]}."""
     app = get_app()
-    await app.session.ensure_logged_in()
     data = await app.markets.search(query, limit=20)
     results = [
         {
@@ -1670,7 +2150,6 @@ async def search(query: str) -> dict[str, Any]:
 async def fetch(id: str) -> dict[str, Any]:
     """ChatGPT Deep Research: fetch a market's details. Returns {id,title,text,url,metadata}."""
     app = get_app()
-    await app.session.ensure_logged_in()
     data = await app.markets.get(id)
     instrument = data.get("instrument", {})
     title = instrument.get("name") or id
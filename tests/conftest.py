@@ -2,7 +2,9 @@
 
 Tools are exercised through FastMCP's in-memory transport with
 capital_mcp.context.get_app monkeypatched to a fake whose services are
-AsyncMocks — no network, no credentials.
+AsyncMocks — no network, no credentials. The server module is imported once
+here, so tool/resource/prompt registration happens at collection time rather
+than inside the first test.
 """
 
 from types import SimpleNamespace
@@ -11,6 +13,8 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 import capital_mcp.context as ctx
+import capital_mcp.server as server
+from capital_mcp import cache, candles, confirmations
 
 
 @pytest.fixture
@@ -56,8 +60,11 @@ def patch_app(monkeypatch, fake_app):
     # Clear any process-global app left behind by other tests so the lifespan's
     # shutdown does not try to __aexit__ a stale (non-async-context) instance.
     ctx.reset_app()
+    confirmations.reset()
+    cache.reset()
+    candles.reset()
     monkeypatch.setattr(ctx, "get_app", lambda: fake_app)
-    import capital_mcp.server as server
+    server._PREVIEW_REQUESTS.clear()
     monkeypatch.setattr(server, "get_app", lambda: fake_app)
     return fake_app
 
@@ -67,7 +74,5 @@ async def client(patch_app):
     """An in-memory FastMCP client bound to the server, with get_app patched."""
     from fastmcp import Client
 
-    from capital_mcp.server import mcp
-
-    async with Client(mcp) as c:
+    async with Client(server.mcp) as c:
         yield c
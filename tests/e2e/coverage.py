@@ -18,6 +18,7 @@ E2E_COVERAGE = {
     "cap_market_navigation_root": "test_e2e_read.py::test_e2e_market_navigation",
     "cap_market_navigation_node": "test_e2e_read.py::test_e2e_market_navigation",
     "cap_market_prices": "test_e2e_read.py::test_e2e_market_prices",
+    "cap_market_prices_batch": "test_e2e_read.py::test_e2e_market_prices_batch",
     "cap_market_sentiment": "test_e2e_read.py::test_e2e_market_sentiment",
     # account
     "cap_account_list": "test_e2e_read.py::test_e2e_account_list",
@@ -32,6 +33,7 @@ E2E_COVERAGE = {
     "cap_trade_orders_list": "test_e2e_read.py::test_e2e_orders_list",
     "cap_trade_confirm_get": "test_e2e_read.py::test_e2e_confirm_get_negative",
     "cap_trade_confirm_wait": "test_e2e_trading.py::test_e2e_execute_close_position",
+    "cap_trade_confirm_collect": "test_e2e_trading.py::test_e2e_execute_close_position",
     # trading preview / execute / mutate
     "cap_trade_preview_position": "test_e2e_trading.py::test_e2e_preview_position",
     "cap_trade_preview_working_order": "test_e2e_trading.py::test_e2e_preview_working_order",
@@ -48,6 +50,8 @@ E2E_COVERAGE = {
     "cap_watchlists_add_market": "test_e2e_read.py::test_e2e_watchlist_lifecycle",
     "cap_watchlists_remove_market": "test_e2e_read.py::test_e2e_watchlist_lifecycle",
     "cap_watchlists_delete": "test_e2e_read.py::test_e2e_watchlist_lifecycle",
+    "cap_watchlists_add_markets": "test_e2e_read.py::test_e2e_watchlist_lifecycle",
+    "cap_watchlists_remove_markets": "test_e2e_read.py::test_e2e_watchlist_lifecycle",
     # streaming
     "cap_stream_prices": "test_e2e_stream.py::test_e2e_stream_prices",
     "cap_stream_candles": "test_e2e_stream.py::test_e2e_stream_candles",
@@ -76,6 +76,17 @@ async def test_e2e_market_prices(mcp_client):
     assert data.get("prices")
 
 
+async def test_e2e_market_prices_batch(mcp_client):
+    data = await _call(
+        mcp_client,
+        "cap_market_prices_batch",
+        {"epics": [EPIC, EPIC], "resolution": "HOUR", "max": 5},
+    )
+    assert list(data["prices"]) == [EPIC]
+    assert data["prices"][EPIC].get("prices")
+    assert data["failed"] == []
+
+
 async def test_e2e_market_sentiment(mcp_client):
     data = await _call(mcp_client, "cap_market_sentiment", {"market_id": EPIC})
     assert isinstance(data, dict)
@@ -173,6 +184,19 @@ async def test_e2e_watchlist_lifecycle(mcp_client):
             "cap_watchlists_remove_market",
             {"watchlist_id": wl_id, "epic": EPIC, "confirm": True},
         )
+        bulk = [EPIC, "SILVER"]
+        added = await _call(
+            mcp_client,
+            "cap_watchlists_add_markets",
+            {"watchlist_id": wl_id, "epics": bulk, "confirm": True},
+        )
+        assert added["added"] == bulk, added["failed"]
+        removed = await _call(
+            mcp_client,
+            "cap_watchlists_remove_markets",
+            {"watchlist_id": wl_id, "epics": bulk, "confirm": True},
+        )
+        assert removed["removed"] == bulk, removed["failed"]
     finally:
         await _call(
             mcp_client, "cap_watchlists_delete", {"watchlist_id": wl_id, "confirm": True}
@@ -94,6 +94,10 @@ async def test_e2e_execute_close_position(mcp_client):
         mcp_client, "cap_trade_confirm_wait", {"deal_reference": deal_ref, "timeout_s": 15.0}
     )
     assert confirm.get("status") in {"ACCEPTED", "REJECTED", "TIMEOUT"}
+    collected = await _call(
+        mcp_client, "cap_trade_confirm_collect", {"deal_references": [deal_ref]}
+    )
+    assert collected["confirmations"][deal_ref].get("status") == confirm.get("status")
     positions = (await _call(mcp_client, "cap_trade_positions_list")).get("positions", [])
     deal_id = next(
         (
@@ -7,10 +7,13 @@ suite. Regenerate intentionally with: `UPDATE_SNAPSHOT=1 pytest
 tests/test_api_surface_snapshot.py` (or `make snapshot`).
 """
 
+import asyncio
 import json
 import os
 import pathlib
 
+import pytest
+
 SNAPSHOT = pathlib.Path(__file__).parent / "snapshots" / "api_surface.json"
 
 
@@ -37,25 +40,41 @@ async def build_surface(client) -> dict:
     }
 
 
-async def test_surface_counts(client):
-    surface = await build_surface(client)
-    assert len(surface["tools"]) == 42
+@pytest.fixture(scope="module")
+def surface() -> dict:
+    """The live surface, captured once for every test in this module.
+
+    Listing needs no broker, so this uses a plain in-memory client instead of the
+    per-test ``client`` fixture (same approach as test_e2e_coverage).
+    """
+    from fastmcp import Client
+
+    from capital_mcp.server import mcp
+
+    async def capture() -> dict:
+        async with Client(mcp) as client:
+            return await build_surface(client)
+
+    return asyncio.run(capture())
+
+
+def test_surface_counts(surface):
+    assert len(surface["tools"]) == 46
     assert len(surface["resources"]) == 3
-    assert len(surface["resource_templates"]) == 1
+    assert len(surface["resource_templates"]) == 2
     assert len(surface["prompts"]) == 7
 
 
-async def test_api_surface_snapshot(client):
-    live = await build_surface(client)
+def test_api_surface_snapshot(surface):
     if os.getenv("UPDATE_SNAPSHOT"):
         SNAPSHOT.parent.mkdir(parents=True, exist_ok=True)
-        SNAPSHOT.write_text(json.dumps(live, indent=2, sort_keys=True) + "\n")
+        SNAPSHOT.write_text(json.dumps(surface, indent=2, sort_keys=True) + "\n")
     assert SNAPSHOT.exists(), (
         "Missing golden snapshot. Generate it once with: "
         "UPDATE_SNAPSHOT=1 pytest tests/test_api_surface_snapshot.py"
     )
     expected = json.loads(SNAPSHOT.read_text())
-    assert live == expected, (
+    assert surface == expected, (
         "MCP API surface changed vs the frozen contract. If this change is "
         "INTENTIONAL: regenerate with `make snapshot`, record it in "
         "CHANGELOG.md, and update docs/api-stability.md. If UNINTENTIONAL: "
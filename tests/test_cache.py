@@ -0,0 +1,103 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from capital_mcp import cache as cache_mod
+from capital_mcp.cache import TTLCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_hit_within_ttl_and_reload_after_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl_s=10)
+    load = AsyncMock(side_effect=[{"v": 1}, {"v": 2}])
+    assert await cache.get_or_load("k", load) == {"v": 1}
+    assert await cache.get_or_load("k", load) == {"v": 1}
+    now[0] += 11
+    assert await cache.get_or_load("k", load) == {"v": 2}
+    assert load.await_count == 2
+
+
+async def test_stale_entry_is_served_while_it_refreshes(monkeypatch):
+    import asyncio
+
+    now = [100.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl_s=10, stale_s=20)
+    gate = asyncio.Event()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        if len(calls) == 2:
+            await gate.wait()
+        return {"v": len(calls)}
+
+    assert await cache.get_or_load("k", load) == {"v": 1}
+    now[0] += 15  # past the TTL, inside the stale window
+    assert await cache.get_or_load("k", load) == {"v": 1}
+    assert await cache.get_or_load("k", load) == {"v": 1}  # refresh already running
+    gate.set()
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert await cache.get_or_load("k", load) == {"v": 2}
+    assert len(calls) == 2
+    now[0] += 31  # past the stale window: blocks on a normal load
+    assert await cache.get_or_load("k", load) == {"v": 3}
+
+
+async def test_evicts_oldest_beyond_maxsize():
+    cache = TTLCache(ttl_s=60, maxsize=2)
+    for key in ("a", "b", "c"):
+        await cache.get_or_load(key, AsyncMock(return_value=key))
+    load = AsyncMock(return_value="a2")
+    assert await cache.get_or_load("a", load) == "a2"
+    load.assert_awaited_once()
+
+
+async def test_single_flight_coalesces_concurrent_loads_only():
+    import asyncio
+
+    from capital_mcp.cache import SingleFlight
+
+    flight = SingleFlight()
+    gate = asyncio.Event()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await gate.wait()
+        return {"v": len(calls)}
+
+    waiters = [asyncio.create_task(flight.do("k", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*waiters)
+    assert results == [{"v": 1}] * 5
+    assert len(calls) == 1
+    # Nothing is kept after the load finishes.
+    assert await flight.do("k", load) == {"v": 2}
+
+
+async def test_concurrent_misses_share_one_load_and_its_error():
+    import asyncio
+
+    cache = TTLCache(ttl_s=60)
+    gate = asyncio.Event()
+    calls = []
+
+    async def failing_load():
+        calls.append(1)
+        await gate.wait()
+        raise RuntimeError("upstream down")
+
+    waiters = [asyncio.create_task(cache.get_or_load("k", failing_load)) for _ in range(4)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert len(calls) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    # The failure is not cached; the next read retries.
+    assert await cache.get_or_load("k", AsyncMock(return_value="ok")) == "ok"
@@ -0,0 +1,68 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from capital_mcp import candles
+
+pytestmark = pytest.mark.asyncio
+
+
+def _bar(ts, close):
+    return {"snapshotTimeUTC": ts, "closePrice": {"bid": close}}
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    candles.reset()
+    yield
+    candles.reset()
+
+
+async def test_repeat_read_fetches_only_the_tail():
+    full = [_bar(f"2026-01-01T0{h}:00:00", h) for h in range(4)]
+    tail = [_bar("2026-01-01T02:00:00", 2), _bar("2026-01-01T03:00:00", 3.5)]
+    tail.append(_bar("2026-01-01T04:00:00", 4))
+    fetch = AsyncMock(
+        side_effect=[{"instrumentType": "COMMODITIES", "prices": full}, {"prices": tail}]
+    )
+
+    first = await candles.prices(fetch, "GOLD", "HOUR", 3)
+    assert first["prices"] == full
+
+    second = await candles.prices(fetch, "GOLD", "HOUR", 3)
+    _, kwargs = fetch.await_args
+    assert kwargs["from_date"] == "2026-01-01T02:00:00"
+    assert second["instrumentType"] == "COMMODITIES"
+    assert [b["closePrice"]["bid"] for b in second["prices"]] == [2, 3.5, 4]
+
+
+async def test_full_page_tail_falls_back_to_full_fetch(monkeypatch):
+    monkeypatch.setattr(candles, "MAX_BARS", 2)
+    full = [_bar("2026-01-01T00:00:00", 0), _bar("2026-01-01T01:00:00", 1)]
+    gap = [_bar("2026-01-02T00:00:00", 9), _bar("2026-01-02T01:00:00", 10)]
+    fresh = {"prices": [_bar("2026-01-03T00:00:00", 20), _bar("2026-01-03T01:00:00", 21)]}
+    fetch = AsyncMock(side_effect=[{"prices": full}, {"prices": gap}, fresh])
+
+    await candles.prices(fetch, "GOLD", "HOUR", 2)
+    assert await candles.prices(fetch, "GOLD", "HOUR", 2) == fresh
+    assert fetch.await_count == 3
+
+
+async def test_failed_tail_drops_the_window_and_fetches_in_full():
+    full = [_bar("2026-01-01T00:00:00", 0), _bar("2026-01-01T01:00:00", 1)]
+    fresh = {"prices": [_bar("2026-01-03T00:00:00", 20), _bar("2026-01-03T01:00:00", 21)]}
+    fetch = AsyncMock(side_effect=[{"prices": full}, RuntimeError("502"), fresh])
+
+    await candles.prices(fetch, "GOLD", "HOUR", 2)
+    assert await candles.prices(fetch, "GOLD", "HOUR", 2) == fresh
+    assert fetch.await_args.kwargs["from_date"] is None
+    assert list(candles._windows[("GOLD", "HOUR")][1]) == fresh["prices"]
+
+
+async def test_bars_without_timestamps_are_not_windowed():
+    data = {"prices": [{"closePrice": {"bid": 1}}, {"closePrice": {"bid": 2}}]}
+    fetch = AsyncMock(return_value=data)
+    await candles.prices(fetch, "GOLD", "HOUR", 2)
+    await candles.prices(fetch, "GOLD", "HOUR", 2)
+    for call in fetch.await_args_list:
+        assert call.kwargs["from_date"] is None
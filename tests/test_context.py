@@ -1,6 +1,7 @@
 """Tests for the shared CapitalComApp lifecycle."""
 
 import os
+from types import SimpleNamespace
 
 from fastmcp import Client
 
@@ -37,6 +38,180 @@ def test_reset_app_clears_singleton(monkeypatch):
     assert first is not second
 
 
+def test_get_app_tunes_sdk_http_pool(monkeypatch):
+    config = SimpleNamespace(api_base_url="https://example.test", cap_http_timeout_s=7.0)
+    sdk_client = SimpleNamespace(_client=None, config=config)
+
+    class FakeApp:
+        def __init__(self):
+            self.session = SimpleNamespace(client=sdk_client)
+
+    monkeypatch.setattr(ctx, "CapitalComApp", FakeApp)
+    ctx.reset_app()
+    ctx.get_app()
+    tuned = sdk_client._client
+    assert str(tuned.base_url) == "https://example.test"
+    assert tuned.timeout.read == 7.0
+    assert tuned.headers["User-Agent"].startswith("capitalcom-cli/")
+    ctx.reset_app()
+
+
+def test_tuning_falls_back_to_the_sdk_client_when_config_is_missing():
+    sdk_client = SimpleNamespace(_client=None)  # no .config: SDK internals changed
+    ctx._tune_http_client(SimpleNamespace(session=SimpleNamespace(client=sdk_client)))
+    assert sdk_client._client is None
+
+
+async def test_concurrent_logins_and_pings_share_one_request():
+    import asyncio
+
+    gate = asyncio.Event()
+    logins = []
+
+    async def ensure_logged_in():
+        logins.append(1)
+        await gate.wait()
+
+    relogins = []
+
+    async def force_relogin():
+        relogins.append(1)
+        await gate.wait()
+
+    pings = []
+
+    async def ping():
+        pings.append(1)
+        await gate.wait()
+        return {"status": "OK"}
+
+    client = SimpleNamespace(set_relogin=lambda cb: setattr(client, "relogin", cb))
+    session = SimpleNamespace(
+        ensure_logged_in=ensure_logged_in,
+        _force_relogin=force_relogin,
+        ping=ping,
+        client=client,
+    )
+    ctx._coalesce_session_calls(SimpleNamespace(session=session))
+
+    waiters = [asyncio.create_task(session.ensure_logged_in()) for _ in range(5)]
+    waiters += [asyncio.create_task(client.relogin()) for _ in range(3)]
+    waiters += [asyncio.create_task(session.ping()) for _ in range(4)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*waiters)
+    assert len(logins) == 1
+    assert len(relogins) == 1
+    assert len(pings) == 1
+    assert results[-4:] == [{"status": "OK"}] * 4
+    # Nothing is remembered: a later expiry logs in again.
+    await session.ensure_logged_in()
+    assert len(logins) == 2
+
+
+async def test_valid_token_skips_the_login_flight(monkeypatch):
+    from unittest.mock import AsyncMock
+
+    from capital_cli.core.models import SessionTokens
+
+    ensure = AsyncMock()
+    session = SimpleNamespace(
+        tokens=SessionTokens(cst="c", x_security_token="x"), ensure_logged_in=ensure
+    )
+    ctx._coalesce_session_calls(SimpleNamespace(session=session))
+    flight = AsyncMock(side_effect=AssertionError("valid token took the flight"))
+    monkeypatch.setattr(ctx._SESSION_FLIGHT, "do", flight)
+    await session.ensure_logged_in()
+    ensure.assert_awaited_once()
+
+
+async def test_ping_is_coalesced_on_its_own():
+    import asyncio
+
+    gate = asyncio.Event()
+    pings = []
+
+    async def ping():
+        pings.append(1)
+        await gate.wait()
+        return {"status": "OK"}
+
+    session = SimpleNamespace(ping=ping)  # no ensure_logged_in / relogin hooks
+    ctx._coalesce_session_calls(SimpleNamespace(session=session))
+    waiters = [asyncio.create_task(session.ping()) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+    assert await asyncio.gather(*waiters) == [{"status": "OK"}] * 3
+    assert len(pings) == 1
+
+
+async def test_rebuilt_app_still_logs_in(monkeypatch):
+    import asyncio
+
+    logins = []
+
+    async def ensure_logged_in():
+        logins.append(1)
+
+    # The SDK's session manager is a process-wide singleton shared by every app.
+    session = SimpleNamespace(tokens=None, ensure_logged_in=ensure_logged_in)
+
+    class FakeApp:
+        def __init__(self):
+            self.session = session
+
+    monkeypatch.setattr(ctx, "CapitalComApp", FakeApp)
+    ctx.reset_app()
+    ctx.get_app()
+    ctx.reset_app()
+    ctx.get_app()
+    await asyncio.wait_for(session.ensure_logged_in(), timeout=1)
+    assert logins == [1]
+    ctx.reset_app()
+
+
+def test_rebuilding_the_app_registers_no_new_caches():
+    from capital_mcp import cache
+
+    before = len(cache._caches)
+    for _ in range(3):
+        session = SimpleNamespace(ensure_logged_in=lambda: None)
+        ctx._coalesce_session_calls(SimpleNamespace(session=session))
+    assert len(cache._caches) == before
+
+
+async def test_keepalive_pings_only_an_idle_live_session():
+    from datetime import datetime, timedelta, timezone
+    from unittest.mock import AsyncMock
+
+    from capital_cli.core.models import SessionTokens
+
+    def app_with(tokens):
+        return SimpleNamespace(session=SimpleNamespace(tokens=tokens, ping=AsyncMock()))
+
+    def used(seconds_ago):
+        last = datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)
+        return SessionTokens(cst="c", x_security_token="x", last_used_at=last)
+
+    idle = app_with(used(300))
+    assert await ctx._ping_if_idle(idle, 240) is True
+    idle.session.ping.assert_awaited_once()
+    for app in (app_with(used(60)), app_with(used(600)), app_with(None)):
+        assert await ctx._ping_if_idle(app, 240) is False
+        app.session.ping.assert_not_awaited()
+
+
+def test_env_int_reads_positive_overrides(monkeypatch):
+    monkeypatch.delenv("CAP_MCP_MAX_INFLIGHT", raising=False)
+    assert ctx._env_int("CAP_MCP_MAX_INFLIGHT", 8) == 8
+    monkeypatch.setenv("CAP_MCP_MAX_INFLIGHT", "4")
+    assert ctx._env_int("CAP_MCP_MAX_INFLIGHT", 8) == 4
+    monkeypatch.setenv("CAP_MCP_MAX_INFLIGHT", "0")
+    assert ctx._env_int("CAP_MCP_MAX_INFLIGHT", 8) == 1
+    monkeypatch.setenv("CAP_MCP_MARKET_CACHE_STALE", "0")
+    assert ctx._env_int("CAP_MCP_MARKET_CACHE_STALE", 30, minimum=0) == 0
+
+
 async def test_server_starts_and_lists_tools_without_credentials(monkeypatch):
     # Glama / MCP-directory introspection launches the server with no creds and
     # calls tools/list. That must succeed even though no CAP_* vars are set.
@@ -48,3 +223,23 @@ async def test_server_starts_and_lists_tools_without_credentials(monkeypatch):
         tools = await client.list_tools()
     assert len(tools) >= 40
     assert ctx._app is None                     # never constructed during introspection
+
+
+async def test_lifespan_cancels_pending_confirmation_polls():
+    import asyncio
+
+    from capital_mcp import confirmations
+
+    started = asyncio.Event()
+
+    async def never_settles():
+        started.set()
+        await asyncio.Event().wait()
+
+    ctx.reset_app()
+    async with Client(mcp):
+        confirmations.track("o_pending", never_settles)
+        await started.wait()
+        task = confirmations._tasks["o_pending"]
+    assert task.cancelled()
+    assert confirmations._tasks == {}
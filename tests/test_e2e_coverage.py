@@ -6,6 +6,7 @@ the server registry directly (mcp.list_tools) so it does NOT build a real app.
 
 import ast
 import asyncio
+import functools
 from pathlib import Path
 
 from tests.e2e.coverage import E2E_COVERAGE, OPTIONAL
@@ -13,22 +14,25 @@ from tests.e2e.coverage import E2E_COVERAGE, OPTIONAL
 E2E_DIR = Path(__file__).parent / "e2e"
 
 
-def _registered_tool_names() -> set[str]:
+@functools.cache
+def _registered_tool_names() -> frozenset[str]:
+    """Tool names from the registry, listed once for both tests."""
     from capital_mcp.server import mcp
 
     async def _list():
-        return {t.name for t in await mcp.list_tools()}
+        return frozenset(t.name for t in await mcp.list_tools())
 
     return asyncio.run(_list())
 
 
-def _funcs_in(filename: str) -> set[str]:
+@functools.cache
+def _funcs_in(filename: str) -> frozenset[str]:
     tree = ast.parse((E2E_DIR / filename).read_text())
-    return {
+    return frozenset(
         n.name
         for n in ast.walk(tree)
         if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
-    }
+    )
 
 
 def test_every_tool_has_an_e2e_entry():
@@ -63,3 +63,40 @@ async def test_execute_trade_happy_path_mentions_two_phase(client):
     text = result.messages[0].content.text.lower()
     assert "two-phase" in text
     assert "confirm=true" in text
+
+
+async def test_trade_proposal_text_is_cached_across_direction_case(client):
+    from capital_mcp import server
+
+    server._trade_proposal_text.cache_clear()
+    first = await client.get_prompt("trade_proposal", {"epic": "SILVER", "direction": "sell"})
+    second = await client.get_prompt("trade_proposal", {"epic": "SILVER", "direction": "SELL"})
+    assert first.messages[0].content.text == second.messages[0].content.text
+    assert "**Direction:** SELL" in first.messages[0].content.text
+    info = server._trade_proposal_text.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+async def test_market_scan_fetches_prices_in_one_batch(client):
+    from capital_mcp import server
+
+    result = await client.get_prompt("market_scan", {"watchlist_id": "wl-1", "timeframe": "day"})
+    text = result.messages[0].content.text
+    assert "cap_market_prices_batch" in text
+    assert "resolution='DAY'" in text
+    assert f"at most {server.MAX_INFLIGHT} in flight" in text
+
+
+async def test_market_scan_rejects_unknown_timeframe(client):
+    result = await client.get_prompt("market_scan", {"watchlist_id": "wl-1", "timeframe": "YEAR"})
+    text = result.messages[0].content.text
+    assert "Invalid timeframe: 'YEAR'" in text
+    assert FOOTER in text
+
+
+async def test_trade_proposal_renders_the_thesis_only_when_given(client):
+    args = {"epic": "GOLD", "direction": "BUY"}
+    plain = await client.get_prompt("trade_proposal", args)
+    argued = await client.get_prompt("trade_proposal", {**args, "thesis": "Breakout above 2000"})
+    assert "Trading Thesis" not in plain.messages[0].content.text
+    assert "**Trading Thesis:**\nBreakout above 2000\n\n---" in argued.messages[0].content.text
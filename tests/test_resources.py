@@ -2,7 +2,24 @@ import json
 
 import pytest
 
-pytestmark = pytest.mark.asyncio
+STATIC_URIS = ["cap://status", "cap://risk-policy", "cap://allowed-epics"]
+
+
+@pytest.mark.parametrize("uri", STATIC_URIS)
+async def test_static_resource_reads_as_json_object(client, uri):
+    result = await client.read_resource(uri)
+    assert len(result) == 1
+    assert isinstance(json.loads(result[0].text), dict)
+
+
+async def test_status_resource(client, fake_app):
+    from capital_mcp import __version__
+
+    result = await client.read_resource("cap://status")
+    payload = json.loads(result[0].text)
+    assert payload["server"]["version"] == __version__
+    assert payload["risk"]["allowlist_mode"] == "SPECIFIC"
+    assert payload["risk"]["allowed_epics"] == ["GOLD", "SILVER"]
 
 
 async def test_risk_policy_resource(client, fake_app):
@@ -18,3 +35,106 @@ async def test_allowed_epics_resource(client, fake_app):
     payload = json.loads(result[0].text)
     assert payload["count"] == 2
     assert payload["mode"] == "SPECIFIC"
+
+
+async def test_market_cache_resource_serves_repeat_reads_from_memory(client, fake_app):
+    fake_app.markets.get.return_value = {
+        "instrument": {"name": "Gold", "type": "COMMODITIES", "dealingRules": {}},
+        "snapshot": {"bid": 2000.0, "offer": 2000.5, "marketStatus": "TRADEABLE"},
+    }
+    first = json.loads((await client.read_resource("cap://market-cache/GOLD"))[0].text)
+    second = json.loads((await client.read_resource("cap://market-cache/GOLD"))[0].text)
+    fake_app.markets.get.assert_awaited_once_with("GOLD")
+    assert first == second
+    assert first["snapshot"]["bid"] == 2000.0
+    assert first["cached_at"]
+    assert first["ttl_s"] > 0
+    assert len(first["etag"]) == 16
+
+
+async def test_market_cache_resource_tolerates_null_sections(client, fake_app):
+    fake_app.markets.get.return_value = {
+        "instrument": {"name": "Gold", "dealingRules": {"minDealSize": None}},
+        "snapshot": None,
+    }
+    payload = json.loads((await client.read_resource("cap://market-cache/GOLD"))[0].text)
+    assert payload["snapshot"]["bid"] is None
+    assert payload["dealing"] == {"min_size": None, "max_size": None, "min_step": None}
+
+
+async def test_market_cache_resource_concurrent_misses_hit_broker_once(client, fake_app):
+    import asyncio
+
+    gate = asyncio.Event()
+
+    async def slow_get(epic):
+        await gate.wait()
+        return {"instrument": {"name": epic}, "snapshot": {"bid": 1.0}}
+
+    fake_app.markets.get.side_effect = slow_get
+    reads = [
+        asyncio.create_task(client.read_resource("cap://market-cache/SILVER")) for _ in range(5)
+    ]
+    await asyncio.sleep(0.05)
+    gate.set()
+    payloads = [json.loads(r[0].text) for r in await asyncio.gather(*reads)]
+    assert fake_app.markets.get.await_count == 1
+    assert {p["instrument_name"] for p in payloads} == {"SILVER"}
+
+
+async def test_market_cache_batch_resource_shares_the_per_epic_cache(client, fake_app):
+    async def fake_get(epic):
+        if epic == "BAD":
+            raise RuntimeError("unknown epic")
+        return {"instrument": {"name": epic}, "snapshot": {"bid": 1.0}}
+
+    fake_app.markets.get.side_effect = fake_get
+    await client.read_resource("cap://market-cache/GOLD")
+    result = await client.read_resource("cap://market-cache-batch/GOLD,SILVER,GOLD,BAD")
+    payload = json.loads(result[0].text)
+    assert sorted(payload["markets"]) == ["GOLD", "SILVER"]
+    assert payload["markets"]["SILVER"]["instrument_name"] == "SILVER"
+    assert payload["failed"] == [{"epic": "BAD", "error": "unknown epic"}]
+    assert [c.args[0] for c in fake_app.markets.get.await_args_list] == ["GOLD", "SILVER", "BAD"]
+
+
+async def test_status_reads_do_not_share_the_server_block(patch_app):
+    from capital_mcp import __version__, server
+
+    first = await server.cap_status_resource()
+    first["server"]["name"] = "mutated"
+    second = await server.cap_status_resource()
+    assert second["server"] == {"name": "Capital.com MCP (unofficial)", "version": __version__}
+
+
+def test_allowlist_is_derived_once_per_policy():
+    from types import SimpleNamespace
+
+    from capital_mcp import server
+
+    first = SimpleNamespace(allowed_epics=["GOLD"])
+    assert server._allowlist(first) == (("GOLD",), False)
+    first.allowed_epics = ["ALL"]  # same (frozen in practice) policy object: memoized
+    assert server._allowlist(first) == (("GOLD",), False)
+    assert server._allowlist(SimpleNamespace(allowed_epics=["ALL"])) == (("ALL",), True)
+
+
+def test_policy_payloads_are_built_once_per_policy(fake_app):
+    from capital_mcp import server
+
+    risk_policy, allowed = server._policy_payloads(fake_app.risk_policy)
+    again = server._policy_payloads(fake_app.risk_policy)
+    assert again[0] is risk_policy and again[1] is allowed
+    assert allowed["allowed_epics"] == ("GOLD", "SILVER")
+
+
+async def test_policy_resource_reads_do_not_share_the_memo(patch_app):
+    from capital_mcp import server
+
+    first = await server.cap_risk_policy_resource()
+    first["limits"]["max_position_size"] = 1e9
+    second = await server.cap_risk_policy_resource()
+    assert second["limits"]["max_position_size"] == 1.0
+    allowed = await server.cap_allowed_epics_resource()
+    allowed["count"] = 0
+    assert (await server.cap_allowed_epics_resource())["count"] == 2
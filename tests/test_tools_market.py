@@ -12,6 +12,44 @@ async def test_market_search_joins_epics(client, fake_app):
     assert result.data == {"markets": [{"epic": "GOLD"}]}
 
 
+async def test_market_search_chunks_long_epic_lists(client, fake_app):
+    epics = [f"E{i}" for i in range(120)]
+
+    async def fake_search(term, *, epics, limit):
+        return {"markets": [{"epic": e} for e in epics.split(",")], "source": "broker"}
+
+    fake_app.markets.search.side_effect = fake_search
+    result = await client.call_tool("cap_market_search", {"epics": epics, "limit": 200})
+    assert fake_app.markets.search.await_count == 3
+    assert [m["epic"] for m in result.data["markets"]] == epics
+    assert result.data["source"] == "broker"
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+async def test_market_search_rejects_non_positive_limit(client, fake_app, limit):
+    result = await client.call_tool("cap_market_search", {"epics": ["GOLD"], "limit": limit})
+    assert result.data["error"] == "Invalid limit"
+    fake_app.markets.search.assert_not_awaited()
+
+
+async def test_market_search_requests_at_most_limit_epics(client, fake_app):
+    fake_app.markets.search.return_value = {"markets": []}
+    await client.call_tool(
+        "cap_market_search", {"epics": ["GOLD", "GOLD", "SILVER", "OIL"], "limit": 2}
+    )
+    fake_app.markets.search.assert_awaited_once_with(None, epics="GOLD,SILVER", limit=2)
+
+
+async def test_market_navigation_is_cached(client, fake_app):
+    fake_app.markets.navigation_root.return_value = {"nodes": [{"id": "n1"}]}
+    fake_app.markets.navigation_node.return_value = {"nodes": []}
+    for _ in range(2):
+        await client.call_tool("cap_market_navigation_root", {})
+        await client.call_tool("cap_market_navigation_node", {"node_id": "n1"})
+    fake_app.markets.navigation_root.assert_awaited_once()
+    fake_app.markets.navigation_node.assert_awaited_once_with("n1")
+
+
 async def test_market_prices_maps_max_to_max_candles(client, fake_app):
     fake_app.markets.prices.return_value = {"prices": []}
     await client.call_tool("cap_market_prices", {"epic": "GOLD", "max": 50})
@@ -20,7 +58,47 @@ async def test_market_prices_maps_max_to_max_candles(client, fake_app):
     )
 
 
+async def test_market_prices_batch_fans_out_and_reports_failures(client, fake_app):
+    async def fake_prices(epic, **kwargs):
+        if epic == "BAD":
+            raise RuntimeError("unknown epic")
+        return {"prices": [{"epic": epic, "max": kwargs["max_candles"]}]}
+
+    fake_app.markets.prices.side_effect = fake_prices
+    result = await client.call_tool(
+        "cap_market_prices_batch",
+        {"epics": ["GOLD", "SILVER", "GOLD", "BAD"], "resolution": "HOUR", "max": 5},
+    )
+    assert fake_app.markets.prices.await_count == 3
+    assert result.data["prices"] == {
+        "GOLD": {"prices": [{"epic": "GOLD", "max": 5}]},
+        "SILVER": {"prices": [{"epic": "SILVER", "max": 5}]},
+    }
+    assert result.data["failed"] == [{"epic": "BAD", "error": "unknown epic"}]
+
+
 async def test_market_sentiment_wraps_single_id(client, fake_app):
     fake_app.markets.sentiment.return_value = {"longPositionPercentage": 60}
     await client.call_tool("cap_market_sentiment", {"market_id": "GOLD"})
     fake_app.markets.sentiment.assert_awaited_once_with(["GOLD"])
+
+
+async def test_concurrent_identical_market_gets_share_one_request(client, fake_app):
+    import asyncio
+
+    gate = asyncio.Event()
+
+    async def slow_get(epic):
+        await gate.wait()
+        return {"instrument": {"epic": epic}}
+
+    fake_app.markets.get.side_effect = slow_get
+    calls = [
+        asyncio.create_task(client.call_tool("cap_market_get", {"epic": "GOLD"}))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0.05)
+    gate.set()
+    results = await asyncio.gather(*calls)
+    assert fake_app.markets.get.await_count == 1
+    assert all(r.data == {"instrument": {"epic": "GOLD"}} for r in results)
@@ -1,4 +1,5 @@
 from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -28,6 +29,18 @@ async def test_stream_prices_collects_ticks(client, fake_app):
     assert result.data["ticks_received"] == 2
 
 
+async def test_stream_prices_returns_latest_100_ticks(client, fake_app):
+    fake_app.stream.prices = lambda epics, duration=300.0: _aiter(
+        [_tick("GOLD", 2000 + i, 2001 + i) for i in range(150)]
+    )
+    result = await client.call_tool(
+        "cap_stream_prices", {"epics": ["GOLD"], "duration_s": 1.0, "update_interval_s": 0.0}
+    )
+    assert result.data["ticks_received"] == 150
+    assert len(result.data["ticks"]) == 100
+    assert result.data["ticks"][0]["bid"] == 2050
+
+
 async def test_stream_prices_rejects_too_many_epics(client, fake_app):
     result = await client.call_tool(
         "cap_stream_prices", {"epics": [f"E{i}" for i in range(41)]}
@@ -60,3 +73,98 @@ async def test_stream_alerts_triggers(client, fake_app):
         {"alerts": {"GOLD": {"level": 2049.0, "direction": "ABOVE"}}, "duration_s": 1.0},
     )
     assert result.data["alerts_triggered"] == 1
+
+
+async def test_stream_alerts_below_and_unknown_direction(client, fake_app):
+    subscribed = []
+
+    def prices(epics, duration=300.0):
+        subscribed.extend(epics)
+        return _aiter([_tick("GOLD", 1990, 1992), _tick("SILVER", 20, 21)])
+
+    fake_app.stream.prices = prices
+    result = await client.call_tool(
+        "cap_stream_alerts",
+        {
+            "alerts": {
+                "GOLD": {"level": 1995.0, "direction": "below"},
+                "SILVER": {"level": 10.0, "direction": "SIDEWAYS"},
+            },
+            "duration_s": 1.0,
+        },
+    )
+    assert result.data["alerts_triggered"] == 1
+    assert result.data["triggered_alerts"][0]["condition"] == "LEVEL_BELOW"
+    assert [r["epic"] for r in result.data["rejected_alerts"]] == ["SILVER"]
+    assert subscribed == ["GOLD"]
+
+
+async def test_stream_alerts_without_a_fireable_alert_returns_at_once(client, fake_app):
+    fake_app.stream.prices = MagicMock()
+    result = await client.call_tool(
+        "cap_stream_alerts",
+        {
+            "alerts": {
+                "GOLD": {"level": 10.0, "direction": "SIDEWAYS"},
+                "SILVER": {"direction": "ABOVE"},
+                "OIL": {},
+            },
+            "duration_s": 300.0,
+        },
+    )
+    assert result.data["error"] == "No valid alerts"
+    assert result.data["triggered_alerts"] == []
+    assert [r["epic"] for r in result.data["rejected_alerts"]] == ["GOLD", "SILVER", "OIL"]
+    assert result.data["rejected_alerts"][1]["error"] == "missing 'level'"
+    fake_app.stream.prices.assert_not_called()
+    fake_app.session.ensure_logged_in.assert_not_awaited()
+
+
+async def test_stream_portfolio_snapshots_positions(client, fake_app):
+    fake_app.trading.list_positions.return_value = {
+        "positions": [
+            {
+                "position": {"dealId": "d1", "direction": "BUY", "size": 2, "level": 1990.0},
+                "market": {"epic": "GOLD", "bid": 1995.0, "offer": 1996.0},
+            },
+            {
+                "position": {"dealId": "d2", "direction": "SELL", "size": 1, "level": 2010.0},
+                "market": {"epic": "GOLD", "bid": 1995.0, "offer": 1996.0},
+            },
+        ]
+    }
+    fake_app.stream.portfolio = lambda epics, duration=300.0: _aiter(
+        [_tick("GOLD", 2000, 2001), _tick("GOLD", 2002, 2004)]
+    )
+    result = await client.call_tool(
+        "cap_stream_portfolio", {"duration_s": 1.0, "update_interval_s": 0.0}
+    )
+    assert result.data["snapshots_collected"] == 2
+    last = result.data["snapshots"][-1]["positions"]
+    assert [r["deal_id"] for r in last] == ["d1", "d2"]
+    assert last[0]["mid"] == 2003.0
+    assert last[0]["pnl_estimate"] == 26.0
+    assert last[1]["pnl_estimate"] == 7.0
+
+
+async def test_stream_alerts_auto_close_stops_after_last_fireable_alert(client, fake_app):
+    seen = []
+
+    async def ticks(epics, duration=300.0):
+        for t in [_tick("GOLD", 2050, 2052), _tick("GOLD", 2060, 2062)]:
+            seen.append(t)
+            yield t
+
+    fake_app.stream.prices = ticks
+    result = await client.call_tool(
+        "cap_stream_alerts",
+        {
+            "alerts": {
+                "GOLD": {"level": 2000.0, "direction": "ABOVE"},
+                "SILVER": {"level": 10.0, "direction": "SIDEWAYS"},
+            },
+            "auto_close": True,
+        },
+    )
+    assert result.data["alerts_triggered"] == 1
+    assert len(seen) == 1
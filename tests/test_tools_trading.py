@@ -14,6 +14,7 @@ async def test_positions_list(client, fake_app):
 
 async def test_confirm_get_calls_module_fn(client, fake_app, monkeypatch):
     from unittest.mock import AsyncMock
+
     fn = AsyncMock(return_value={"status": "ACCEPTED"})
     monkeypatch.setattr(server, "get_confirmation", fn)
     result = await client.call_tool("cap_trade_confirm_get", {"deal_reference": "o_123"})
@@ -23,8 +24,9 @@ async def test_confirm_get_calls_module_fn(client, fake_app, monkeypatch):
 
 async def test_confirm_wait_passes_args(client, fake_app, monkeypatch):
     from unittest.mock import AsyncMock
+
     fn = AsyncMock(return_value={"status": "ACCEPTED"})
-    monkeypatch.setattr(server, "wait_for_confirmation", fn)
+    monkeypatch.setattr(server, "_poll_confirmation", fn)
     await client.call_tool(
         "cap_trade_confirm_wait",
         {"deal_reference": "o_123", "timeout_s": 5.0, "poll_interval_ms": 250},
@@ -32,6 +34,45 @@ async def test_confirm_wait_passes_args(client, fake_app, monkeypatch):
     fn.assert_awaited_once_with("o_123", timeout_s=5.0, poll_interval_ms=250)
 
 
+async def test_concurrent_confirm_waits_share_one_poll(client, fake_app, monkeypatch):
+    import asyncio
+
+    release = asyncio.Event()
+    calls = []
+
+    async def fake_wait(ref, *, timeout_s, poll_interval_ms):
+        calls.append(ref)
+        await release.wait()
+        return {"dealStatus": "ACCEPTED", "status": "ACCEPTED"}
+
+    monkeypatch.setattr(server, "_poll_confirmation", fake_wait)
+    args = {"deal_reference": "o_7", "timeout_s": 5.0}
+    pending = [
+        asyncio.create_task(client.call_tool("cap_trade_confirm_wait", args)) for _ in range(3)
+    ]
+    await asyncio.sleep(0.05)
+    release.set()
+    results = await asyncio.gather(*pending)
+    assert calls == ["o_7"]
+    assert all(r.data["status"] == "ACCEPTED" for r in results)
+
+
+async def test_confirm_collect_gathers_each_reference(client, fake_app, monkeypatch):
+    async def fake_wait(ref, *, timeout_s, poll_interval_ms):
+        if ref == "bad":
+            raise RuntimeError("boom")
+        return {"dealStatus": "ACCEPTED", "status": "ACCEPTED", "dealReference": ref}
+
+    monkeypatch.setattr(server, "_poll_confirmation", fake_wait)
+    result = await client.call_tool(
+        "cap_trade_confirm_collect", {"deal_references": ["o_1", "o_2", "o_1", "bad"]}
+    )
+    confirmations = result.data["confirmations"]
+    assert list(confirmations) == ["o_1", "o_2", "bad"]
+    assert confirmations["o_2"]["status"] == "ACCEPTED"
+    assert confirmations["bad"] == {"status": "ERROR", "message": "boom"}
+
+
 async def test_preview_position_builds_request_and_serializes(client, fake_app):
     from types import SimpleNamespace
 
@@ -42,7 +83,11 @@ async def test_preview_position_builds_request_and_serializes(client, fake_app):
         return SimpleNamespace(
             preview_id="pv-1",
             normalized_request={"epic": "GOLD"},
-            checks=[SimpleNamespace(model_dump=lambda: {"check": "size", "passed": True, "message": "ok"})],
+            checks=[
+                SimpleNamespace(
+                    model_dump=lambda: {"check": "size", "passed": True, "message": "ok"}
+                )
+            ],
             all_checks_passed=True,
             estimated_entry=2000.0,
             estimated_risk_notes=None,
@@ -60,7 +105,11 @@ async def test_preview_position_builds_request_and_serializes(client, fake_app):
     assert captured["req"].size == 0.5
 
 
-async def test_execute_position_maps_wait_flag(client, fake_app):
+async def test_execute_position_maps_wait_flag(client, fake_app, monkeypatch):
+    from unittest.mock import AsyncMock
+
+    poll = AsyncMock(return_value={"status": "TIMEOUT"})
+    monkeypatch.setattr(server, "_poll_confirmation", poll)
     fake_app.trading.execute_position.return_value = {"dealReference": "o_1"}
     await client.call_tool(
         "cap_trade_execute_position",
@@ -71,6 +120,115 @@ async def test_execute_position_maps_wait_flag(client, fake_app):
     )
 
 
+async def test_execute_echoes_previewed_request(client, fake_app, monkeypatch):
+    from types import SimpleNamespace
+
+    async def fake_preview(req):
+        return SimpleNamespace(
+            preview_id="pv-7",
+            normalized_request={
+                "epic": "GOLD", "size": 0.5, "stop_level": 1990.0, "profit_level": None
+            },
+            checks=[],
+            all_checks_passed=True,
+            estimated_entry=2000.0,
+            estimated_risk_notes=None,
+        )
+
+    fake_app.trading.preview_position = fake_preview
+    await client.call_tool(
+        "cap_trade_preview_position", {"epic": "GOLD", "direction": "BUY", "size": 0.5}
+    )
+    fake_app.trading.execute_position.return_value = {
+        "dealReference": "o_7",
+        "confirmation": {"dealStatus": "ACCEPTED", "dealId": "d_7", "level": 2001.0},
+    }
+    result = await client.call_tool(
+        "cap_trade_execute_position", {"preview_id": "pv-7", "confirm": True}
+    )
+    assert result.data["requested"] == {"epic": "GOLD", "size": 0.5, "stop_level": 1990.0}
+    assert result.data["confirmation"]["dealId"] == "d_7"
+
+
+async def test_no_wait_confirmation_is_tracked_in_background(client, fake_app, monkeypatch):
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    raw = {"dealStatus": "ACCEPTED", "status": "OPEN"}
+    waiter = AsyncMock(return_value=raw)
+    getter = AsyncMock(return_value={"dealStatus": "PENDING"})
+    monkeypatch.setattr(server, "_poll_confirmation", waiter)
+    monkeypatch.setattr(server, "get_confirmation", getter)
+    fake_app.trading.execute_position.return_value = {"dealReference": "o_9"}
+    result = await client.call_tool(
+        "cap_trade_execute_position",
+        {"preview_id": "pv-1", "confirm": True, "wait_for_confirm": False, "timeout_s": 5.0},
+    )
+    assert result.data == {"dealReference": "o_9"}
+    await asyncio.sleep(0)
+    waiter.assert_awaited_once_with("o_9", timeout_s=5.0)
+    result = await client.call_tool("cap_trade_confirm_get", {"deal_reference": "o_9"})
+    assert result.data == raw
+    getter.assert_not_awaited()
+
+
+async def test_confirm_wait_outlives_a_shorter_background_poll(client, fake_app, monkeypatch):
+    import asyncio
+
+    windows = []
+
+    async def fake_poll(ref, *, timeout_s, poll_interval_ms=500):
+        windows.append(timeout_s)
+        if len(windows) == 1:  # the background tracker gives up first
+            await asyncio.sleep(0.05)
+            return {"status": "TIMEOUT", "message": f"Confirmation timed out after {timeout_s}s"}
+        return {"dealStatus": "ACCEPTED", "status": "OPEN"}
+
+    monkeypatch.setattr(server, "_poll_confirmation", fake_poll)
+    fake_app.trading.execute_position.return_value = {"dealReference": "o_6"}
+    await client.call_tool(
+        "cap_trade_execute_position",
+        {"preview_id": "pv-1", "confirm": True, "wait_for_confirm": False, "timeout_s": 0.05},
+    )
+    result = await client.call_tool(
+        "cap_trade_confirm_wait", {"deal_reference": "o_6", "timeout_s": 5.0}
+    )
+    assert result.data["status"] == "ACCEPTED"
+    assert windows[0] == 0.05
+    assert 4.0 < windows[1] < 5.0
+
+
+async def test_confirm_get_hit_matches_miss(client, fake_app, monkeypatch):
+    from unittest.mock import AsyncMock
+
+    raw = {"dealStatus": "ACCEPTED", "status": "OPEN", "dealId": "d_8"}
+    getter = AsyncMock(return_value=raw)
+    monkeypatch.setattr(server, "get_confirmation", getter)
+    args = {"deal_reference": "o_8"}
+    miss = await client.call_tool("cap_trade_confirm_get", args)
+    hit = await client.call_tool("cap_trade_confirm_get", args)
+    waited = await client.call_tool("cap_trade_confirm_wait", args)
+    assert hit.data == miss.data == raw
+    assert waited.data == {**raw, "status": "ACCEPTED"}
+    getter.assert_awaited_once_with("o_8")
+
+
+async def test_inline_confirmation_is_not_served_as_raw(client, fake_app, monkeypatch):
+    from unittest.mock import AsyncMock
+
+    raw = {"dealStatus": "REJECTED", "status": "DELETED", "reason": "MARKET_CLOSED"}
+    getter = AsyncMock(return_value=raw)
+    monkeypatch.setattr(server, "get_confirmation", getter)
+    fake_app.trading.close_position.return_value = {
+        "dealReference": "o_8",
+        "confirmation": {**raw, "status": "REJECTED"},  # rewritten by the SDK's wait
+    }
+    await client.call_tool("cap_trade_positions_close", {"deal_id": "d1", "confirm": True})
+    got = await client.call_tool("cap_trade_confirm_get", {"deal_reference": "o_8"})
+    assert got.data == raw
+    getter.assert_awaited_once_with("o_8")
+
+
 async def test_close_position_maps_args(client, fake_app):
     fake_app.trading.close_position.return_value = {"dealReference": "o_2"}
     await client.call_tool("cap_trade_positions_close", {"deal_id": "d1", "confirm": True})
@@ -106,7 +264,12 @@ async def test_amend_order_builds_body(client, fake_app):
     fake_app.trading.amend_order.return_value = {"dealReference": "o_5"}
     await client.call_tool(
         "cap_trade_orders_amend",
-        {"deal_id": "o1", "level": 2050.0, "good_till_date": "2026-12-31T00:00:00", "confirm": True},
+        {
+            "deal_id": "o1",
+            "level": 2050.0,
+            "good_till_date": "2026-12-31T00:00:00",
+            "confirm": True,
+        },
     )
     fake_app.trading.amend_order.assert_awaited_once_with(
         "o1",
@@ -29,3 +29,37 @@ async def test_watchlist_remove_market(client, fake_app):
         "cap_watchlists_remove_market", {"watchlist_id": "w1", "epic": "GOLD", "confirm": True}
     )
     fake_app.watchlists.remove_market.assert_awaited_once_with("w1", "GOLD", confirm=True)
+
+
+async def test_watchlist_mutation_without_confirm_fails_before_login(client, fake_app):
+    from fastmcp.exceptions import ToolError
+
+    with pytest.raises(ToolError, match="confirmation required"):
+        await client.call_tool("cap_watchlists_delete", {"watchlist_id": "w1"})
+    fake_app.session.ensure_logged_in.assert_not_awaited()
+    fake_app.watchlists.delete.assert_not_awaited()
+
+
+async def test_watchlist_add_markets_reports_partial_failure(client, fake_app):
+    async def add(watchlist_id, epic, *, confirm):
+        if epic == "BAD":
+            raise RuntimeError("unknown epic")
+        return {"status": "SUCCESS"}
+
+    fake_app.watchlists.add_market.side_effect = add
+    result = await client.call_tool(
+        "cap_watchlists_add_markets",
+        {"watchlist_id": "w1", "epics": ["GOLD", "BAD", "SILVER", "GOLD"], "confirm": True},
+    )
+    assert result.data["added"] == ["GOLD", "SILVER"]
+    assert result.data["failed"] == [{"epic": "BAD", "error": "unknown epic"}]
+    assert fake_app.watchlists.add_market.await_count == 3
+
+
+async def test_watchlist_remove_markets(client, fake_app):
+    fake_app.watchlists.remove_market.return_value = {"status": "SUCCESS"}
+    result = await client.call_tool(
+        "cap_watchlists_remove_markets",
+        {"watchlist_id": "w1", "epics": ["GOLD", "SILVER"], "confirm": True},
+    )
+    assert result.data == {"watchlist_id": "w1", "removed": ["GOLD", "SILVER"], "failed": []}